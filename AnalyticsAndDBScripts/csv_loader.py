@@ -7,10 +7,28 @@ as an alternative to SQL database queries.
 
 import pandas as pd
 import numpy as np
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Union, IO
 import warnings
 from pathlib import Path
 
+try:
+    import pyarrow  # noqa: F401
+    _CSV_ENGINE = 'pyarrow'
+except ImportError:
+    _CSV_ENGINE = 'c'
+
+# Fixed category set for Measure so filters and groupbys run on int codes
+MEASURE_DTYPE = pd.CategoricalDtype(categories=['OIL', 'GAS', 'WATER'])
+
+# Known production column types; skips pandas' type inference pass on read
+PRODUCTION_DTYPES = {
+    'WellID': 'int64',
+    'Measure': 'category',
+    # Rates need ~7 significant digits; fits upcast to float64 internally
+    'Value': 'float32',
+    'ProducingDays': 'float32',
+}
+
 
 class CSVDataLoader:
     """
@@ -21,28 +39,34 @@ class CSVDataLoader:
     of requiring a database connection.
     """
     
-    def __init__(self, production_csv_path: str, well_list_csv_path: Optional[str] = None):
+    def __init__(self, production_csv_path: Union[str, IO], well_list_csv_path: Optional[str] = None):
         """
         Initialize CSV data loader.
         
         Args:
-            production_csv_path: Path to production data CSV file
+            production_csv_path: Path to production data CSV file, or an open
+                file-like object (e.g. io.BytesIO of an uploaded file)
             well_list_csv_path: Optional path to well list CSV file
             
         Raises:
             FileNotFoundError: If production CSV file doesn't exist
         """
-        self.production_csv_path = Path(production_csv_path)
+        # File-like objects are passed straight to pd.read_csv
+        if hasattr(production_csv_path, 'read'):
+            self.production_csv_path = production_csv_path
+        else:
+            self.production_csv_path = Path(production_csv_path)
+            if not self.production_csv_path.exists():
+                raise FileNotFoundError(f"Production CSV not found: {production_csv_path}")
         self.well_list_csv_path = Path(well_list_csv_path) if well_list_csv_path else None
         
-        if not self.production_csv_path.exists():
-            raise FileNotFoundError(f"Production CSV not found: {production_csv_path}")
-        
         if self.well_list_csv_path and not self.well_list_csv_path.exists():
             raise FileNotFoundError(f"Well list CSV not found: {well_list_csv_path}")
         
         self._production_df = None
         self._well_list_df = None
+        # Row positions per (WellID, Measure), built on the first get_well_production call
+        self._well_rows = None
         
     def load_production_data(self) -> pd.DataFrame:
         """
@@ -55,8 +79,9 @@ class CSVDataLoader:
             ValueError: If required columns are missing or data is invalid
         """
         if self._production_df is None:
-            print(f"Loading production data from {self.production_csv_path}...")
-            df = pd.read_csv(self.production_csv_path)
+            source = self.production_csv_path if isinstance(self.production_csv_path, Path) else 'uploaded file'
+            print(f"Loading production data from {source}...")
+            df = pd.read_csv(self.production_csv_path, dtype=PRODUCTION_DTYPES, engine=_CSV_ENGINE)
             
             # Validate required columns
             required_cols = ['WellID', 'Measure', 'Date', 'Value']
@@ -66,15 +91,15 @@ class CSVDataLoader:
             
             print(f"  Found {len(df)} records")
             
-            # Convert data types
-            df['WellID'] = df['WellID'].astype(np.int64)
+            # WellID/Measure/Value are typed on read; only Date still needs parsing
             df['Date'] = pd.to_datetime(df['Date'])
-            df['Value'] = df['Value'].astype(float)
+            # Narrowest unsigned int that holds the IDs (left as int64 if any are negative)
+            df['WellID'] = pd.to_numeric(df['WellID'], downcast='unsigned')
             
             # Add ProducingDays if not present
             if 'ProducingDays' not in df.columns:
                 print("  ProducingDays column not found, using default value of 30.42")
-                df['ProducingDays'] = 30.42
+                df['ProducingDays'] = np.float32(30.42)
             else:
                 df['ProducingDays'] = df['ProducingDays'].fillna(30.42)
             
@@ -86,6 +111,7 @@ class CSVDataLoader:
                     f"Invalid Measure values: {invalid}. "
                     f"Must be one of: {valid_measures}"
                 )
+            df['Measure'] = df['Measure'].astype(MEASURE_DTYPE)
             
             # Filter out invalid values
             initial_count = len(df)
@@ -108,7 +134,7 @@ class CSVDataLoader:
             print(f"  Final dataset: {len(df)} records")
             print(f"  Wells: {df['WellID'].nunique()}")
             print(f"  Date range: {df['Date'].min()} to {df['Date'].max()}")
-            print(f"  Measures: {df['Measure'].value_counts().to_dict()}")
+            print(f"  Measures: {df['Measure'].value_counts()[lambda c: c > 0].to_dict()}")
             
             self._production_df = df
             
@@ -143,7 +169,7 @@ class CSVDataLoader:
                 else:
                     print("  LastProdDate not found, will derive from production data")
                     prod_df = self.load_production_data()
-                    last_dates = prod_df.groupby(['WellID', 'Measure'])['Date'].max().reset_index()
+                    last_dates = prod_df.groupby(['WellID', 'Measure'], observed=True)['Date'].max().reset_index()
                     last_dates.rename(columns={'Date': 'LastProdDate'}, inplace=True)
                     df = df.merge(last_dates, on=['WellID', 'Measure'], how='left')
                 
@@ -157,7 +183,7 @@ class CSVDataLoader:
                 print("No well list provided, generating from production data...")
                 # Generate well list from production data
                 prod_df = self.load_production_data()
-                df = prod_df.groupby(['WellID', 'Measure']).agg({
+                df = prod_df.groupby(['WellID', 'Measure'], observed=True).agg({
                     'Date': 'max'
                 }).reset_index()
                 df.rename(columns={'Date': 'LastProdDate'}, inplace=True)
@@ -202,17 +228,17 @@ class CSVDataLoader:
         
         prod_df = self.load_production_data()
         
-        # Filter for specific well and measure
-        mask = (
-            (prod_df['WellID'] == wellid) &
-            (prod_df['Measure'] == measure)
-        )
+        # Filter for specific well and measure; one groupby pass serves every later
+        # lookup instead of a full-frame scan per well
+        if self._well_rows is None:
+            self._well_rows = prod_df.groupby(['WellID', 'Measure'], observed=True, sort=False).indices
+        well_df = prod_df.take(self._well_rows.get((wellid, measure), []))
         
         # Filter by date range (fit_months before last_prod_date)
         cutoff_date = last_prod_date - pd.DateOffset(months=fit_months)
-        mask &= (prod_df['Date'] >= cutoff_date) & (prod_df['Date'] <= last_prod_date)
+        mask = (well_df['Date'] >= cutoff_date) & (well_df['Date'] <= last_prod_date)
         
-        result = prod_df[mask].copy()
+        result = well_df[mask].copy()
         
         if result.empty:
             return result[['WellID', 'Measure', 'Date', 'Value']]
@@ -227,6 +253,31 @@ class CSVDataLoader:
         
         return result.reset_index(drop=True)
     
+    def subset(self, wellids) -> 'CSVDataLoader':
+        """
+        Create a loader holding only the given wells' rows.
+        
+        Used to hand each parallel worker just the production data it
+        needs rather than pickling the full dataset per task.
+        
+        Args:
+            wellids: Collection of WellIDs to keep
+            
+        Returns:
+            New CSVDataLoader with production/well list data pre-loaded
+        """
+        prod_df = self.load_production_data()
+        well_list_df = self.load_well_list()
+        
+        sub = CSVDataLoader.__new__(CSVDataLoader)
+        # Data is pre-loaded, so the source (possibly a large in-memory upload) isn't carried along
+        sub.production_csv_path = self.production_csv_path if isinstance(self.production_csv_path, Path) else None
+        sub.well_list_csv_path = self.well_list_csv_path
+        sub._production_df = prod_df[prod_df['WellID'].isin(wellids)]
+        sub._well_list_df = well_list_df[well_list_df['WellID'].isin(wellids)]
+        sub._well_rows = None
+        return sub
+    
     def get_summary_stats(self) -> Dict:
         """
         Get summary statistics for the loaded production data.
@@ -245,8 +296,8 @@ class CSVDataLoader:
                 'min': prod_df['Date'].min(),
                 'max': prod_df['Date'].max()
             },
-            'measures': prod_df['Measure'].value_counts().to_dict(),
-            'wells_by_measure': prod_df.groupby('Measure')['WellID'].nunique().to_dict()
+            'measures': prod_df['Measure'].value_counts()[lambda c: c > 0].to_dict(),
+            'wells_by_measure': prod_df.groupby('Measure', observed=True)['WellID'].nunique().to_dict()
         }
         
         return stats
@@ -272,7 +323,7 @@ class CSVDataLoader:
             issues['warnings'].append(f"Found {duplicates} duplicate records (same WellID/Measure/Date)")
         
         # Check for gaps in production data
-        for (wellid, measure), group in prod_df.groupby(['WellID', 'Measure']):
+        for (wellid, measure), group in prod_df.groupby(['WellID', 'Measure'], observed=True):
             dates = group['Date'].sort_values()
             if len(dates) > 1:
                 gaps = (dates.diff() > pd.Timedelta(days=45)).sum()  # More than 1.5 months
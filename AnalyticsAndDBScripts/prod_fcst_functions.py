@@ -2,14 +2,25 @@ import numpy as np
 import ruptures as rpt
 from petbox import dca
 import statsmodels.api as sm
-import scipy.stats
 import pytensor.tensor as pt
 import pymc as pm
-from scipy.optimize import curve_fit, differential_evolution
+from scipy.optimize import curve_fit, differential_evolution, least_squares
 from functools import partial
 import numbers
 from typing import Tuple, Dict
 import gc
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    # numba is optional (see the 'ml' extra); kernels then run as plain Python
+    HAS_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
 
 
 # Create MonthDiff function to calculate time difference in months
@@ -96,6 +107,140 @@ def arps_decline(UID, phase, Qi, Dei, Def, b, t, prior_cum=0, prior_t=0):
 varps_decline = np.vectorize(arps_decline, otypes=[float, float, float, float, float, float])
 
 
+# Compiled kernel for arps_decline over a 1-D array of months; fills q, De_t and Np in place
+@njit(cache=True, fastmath=True, error_model='numpy')
+def _arps_decline_kernel(Qi, Dei, Def, b, t, q_out, De_out, Np_out):
+    D_lim = -np.log(1 - Def)
+    if abs(Dei - Def) <= 1e-8 + 1e-5 * abs(Def):
+        D_exp = -np.log(1 - Dei)
+        for i in range(t.size):
+            q = Qi * np.exp(-D_exp * (t[i] / 12))
+            q_out[i] = q
+            De_out[i] = Dei
+            Np_out[i] = (Qi - q) / D_exp * 365
+    elif Dei > Def and b == 1:
+        Dn = Dei / (1 - Dei)
+        Qlim = Qi * (D_lim / Dn)
+        tlim = (((Qi / Qlim) - 1) / Dn) * 12
+        for i in range(t.size):
+            Dn_t = Dn / (1 + Dn * (t[i] / 12))
+            De_t = 1 - (1 / (Dn_t + 1))
+            if De_t > Def:
+                q = Qi / (1 + b * Dn * (t[i] / 12))
+                Np = (Qi / Dn) * np.log(Qi / q) * 365
+            else:
+                q = Qlim * np.exp(-D_lim * ((t[i] - tlim) / 12))
+                Np = ((Qlim - q) / D_lim * 365) + ((Qi / Dn) * np.log(Qi / Qlim) * 365)
+                De_t = Def
+            q_out[i] = q
+            De_out[i] = De_t
+            Np_out[i] = Np
+    else:
+        Dn = (1 / b) * (((1 - Dei) ** -b) - 1)
+        Qlim = Qi * (D_lim / Dn) ** (1 / b)
+        tlim = ((((Qi / Qlim) ** b) - 1) / (b * Dn)) * 12
+        for i in range(t.size):
+            Dn_t = Dn / (1 + b * Dn * (t[i] / 12))
+            De_t = 1 - (1 / ((Dn_t * b) + 1)) ** (1 / b)
+            if De_t > Def:
+                q = Qi * (1 + b * Dn * (t[i] / 12)) ** (-1 / b)
+                Np = ((Qi ** b) / (Dn * (1 - b))) * ((Qi ** (1 - b)) - (q ** (1 - b))) * 365
+            else:
+                q = Qlim * np.exp(-D_lim * ((t[i] - tlim) / 12))
+                Np = ((Qlim - q) / D_lim * 365) + (((Qi ** b) / (Dn * (1 - b))) * ((Qi ** (1 - b)) - (Qlim ** (1 - b))) * 365)  # noqa
+                De_t = Def
+            q_out[i] = q
+            De_out[i] = De_t
+            Np_out[i] = Np
+
+
+# numba twin of varps_decline for scalar parameters and an array of months (same return layout)
+def arps_decline_nb(UID, phase, Qi, Dei, Def, b, t, prior_cum=0, prior_t=0):
+    t = np.asarray(t, dtype=np.float64)
+    t_flat = np.ascontiguousarray(t.ravel())
+    q = np.empty_like(t_flat)
+    De_t = np.empty_like(t_flat)
+    Np = np.empty_like(t_flat)
+    _arps_decline_kernel(np.float64(Qi), np.float64(Dei), np.float64(Def), np.float64(b), t_flat, q, De_t, Np)
+    shape = t.shape
+    return (
+        np.full(shape, UID, dtype=float), np.full(shape, phase, dtype=float), t + prior_t,
+        q.reshape(shape), De_t.reshape(shape), Np.reshape(shape) + prior_cum
+    )
+
+
+# Compiled kernel over many wells; rows of the (N, T) outputs are filled in parallel
+@njit(cache=True, parallel=True)
+def _arps_decline_many_kernel(Qi, Dei, Def, b, t, q_out, De_out, Np_out):
+    for i in prange(Qi.size):
+        _arps_decline_kernel(Qi[i], Dei[i], Def[i], b[i], t, q_out[i], De_out[i], Np_out[i])
+
+
+# Forecast many wells at once: (N,) parameters and (T,) months -> (N, T) rate and cumulative
+def varps_decline_many(Qi, Dei, Def, b, t):
+    if not HAS_NUMBA:
+        # The interpreted kernel would loop per element; the numpy broadcast is faster
+        return varps_decline_batch(Qi, Dei, Def, b, t)
+    Qi, Dei, Def, b = (np.ascontiguousarray(x, dtype=np.float64).ravel() for x in (Qi, Dei, Def, b))
+    t = np.ascontiguousarray(t, dtype=np.float64).ravel()
+    q = np.empty((Qi.size, t.size))
+    De_t = np.empty_like(q)
+    Np = np.empty_like(q)
+    _arps_decline_many_kernel(Qi, Dei, Def, b, t, q, De_t, Np)
+    return q, Np
+
+
+# Broadcast arps_decline over many wells at once: per-well parameter arrays (N,) and months (T,)
+def varps_decline_batch(Qi, Dei, Def, b, t):
+    '''
+    Args:
+    - Qi, Dei, Def, b are arrays of length N with one entry per well (same meaning as in arps_decline)
+    - t is an array of T month integers shared by all wells
+    Returns:
+    - q: (N, T) array of production rates
+    - Np: (N, T) array of cumulative production
+    '''
+    Qi, Dei, Def, b = (np.asarray(x, dtype=np.float64).reshape(-1, 1) for x in (Qi, Dei, Def, b))
+    t = np.asarray(t, dtype=np.float64).reshape(1, -1)
+
+    is_exp = np.isclose(Dei, Def)
+    is_har = ~is_exp & (Dei > Def) & (b == 1)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        D_lim = -np.log(1 - Def)
+        D_exp = -np.log(1 - Dei)
+
+        # Hyperbolic and harmonic share Dn, Qlim, tlim and the rate equation when b == 1
+        Dn = (1 / b) * (((1 - Dei) ** -b) - 1)
+        Qlim = Qi * (D_lim / Dn) ** (1 / b)
+        tlim = ((((Qi / Qlim) ** b) - 1) / (b * Dn)) * 12
+        Dn_t = Dn / (1 + b * Dn * (t / 12))
+        De_t = 1 - (1 / ((Dn_t * b) + 1)) ** (1 / b)
+        before_lim = De_t > Def
+
+        q_dec = Qi * (1 + b * Dn * (t / 12)) ** (-1 / b)
+        q_tail = Qlim * np.exp(-D_lim * ((t - tlim) / 12))
+        Np_hyp = ((Qi ** b) / (Dn * (1 - b))) * ((Qi ** (1 - b)) - (q_dec ** (1 - b))) * 365
+        Np_hyp_lim = ((Qi ** b) / (Dn * (1 - b))) * ((Qi ** (1 - b)) - (Qlim ** (1 - b))) * 365
+        Np_har = (Qi / Dn) * np.log(Qi / q_dec) * 365
+        Np_har_lim = (Qi / Dn) * np.log(Qi / Qlim) * 365
+        Np_tail = (Qlim - q_tail) / D_lim * 365
+
+        q_exp = Qi * np.exp(-D_exp * (t / 12))
+        Np_exp = (Qi - q_exp) / D_exp * 365
+
+        q = np.where(before_lim, q_dec, q_tail)
+        Np = np.where(
+            is_har,
+            np.where(before_lim, Np_har, Np_tail + Np_har_lim),
+            np.where(before_lim, Np_hyp, Np_tail + Np_hyp_lim)
+        )
+        q = np.where(is_exp, q_exp, q)
+        Np = np.where(is_exp, Np_exp, Np)
+
+    return q, Np
+
+
 # Smooth hyperbolic→exp tail in PyTensor (months in, rate out)
 def arps_q_pt(t_mo, Qi, Dei, Def, b, exp_tol=1e-10):
     eps = 1e-8
@@ -127,8 +272,84 @@ def arps_q_pt(t_mo, Qi, Dei, Def, b, exp_tol=1e-10):
     return pt.switch(is_exp, q_exp_pure, q_piecewise)
 
 
+# Compiled arps_q_np for scalar parameters over a 1-D array of months; fills q in place
+@njit(cache=True, fastmath=True, error_model='numpy')
+def _arps_q_kernel(t_mo, Qi, Dei, Def, b, q_out):
+    if abs(Dei - Def) <= 1e-8 + 1e-5 * abs(Def):
+        D_day = -np.log(1.0 - Dei) / 365.0
+        for i in range(t_mo.size):
+            q_out[i] = Qi * np.exp(-D_day * t_mo[i] * (365.0 / 12.0))
+        return
+    b_ = max(b, 1e-8)
+    Di0_day = (((1.0 - Dei) ** -b_ - 1.0) / b_) / 365.0
+    Dmin_day = -np.log(1.0 - Def) / 365.0
+    tx = max((1.0 / Dmin_day - 1.0 / Di0_day) / b_, 0.0)
+    qx = Qi * (1.0 + b_ * Di0_day * tx) ** (-1.0 / b_)
+    for i in range(t_mo.size):
+        t_d = t_mo[i] * (365.0 / 12.0)
+        if t_d <= tx:
+            q_out[i] = Qi * (1.0 + b_ * Di0_day * t_d) ** (-1.0 / b_)
+        else:
+            q_out[i] = qx * np.exp(-Dmin_day * (t_d - tx))
+
+
+# Compiled arps_q_np_jac; fills the (T, 4) jac_out in place
+@njit(cache=True, fastmath=True, error_model='numpy')
+def _arps_q_jac_kernel(t_mo, Qi, Dei, Def, b, jac_out):
+    if abs(Dei - Def) <= 1e-8 + 1e-5 * abs(Def):
+        D_day = -np.log(1.0 - Dei) / 365.0
+        for i in range(t_mo.size):
+            t_d = t_mo[i] * (365.0 / 12.0)
+            q = Qi * np.exp(-D_day * t_d)
+            jac_out[i, 0] = q / Qi
+            jac_out[i, 1] = -q * t_d / (365.0 * (1.0 - Dei))
+            jac_out[i, 2] = 0.0
+            jac_out[i, 3] = 0.0
+        return
+    b_ = max(b, 1e-8)
+
+    g = (1.0 - Dei) ** -b_
+    Di0_day = ((g - 1.0) / b_) / 365.0
+    dD_dDei = (1.0 - Dei) ** (-b_ - 1.0) / 365.0
+    dD_db = (-g * np.log(1.0 - Dei) * b_ - (g - 1.0)) / (365.0 * b_ ** 2)
+    Dmin_day = -np.log(1.0 - Def) / 365.0
+    dm_dDef = 1.0 / (365.0 * (1.0 - Def))
+
+    tx_raw = (1.0 / Dmin_day - 1.0 / Di0_day) / b_
+    tx = max(tx_raw, 0.0)
+    qx = Qi * (1.0 + b_ * Di0_day * tx) ** (-1.0 / b_)
+
+    ratio = Dmin_day / Di0_day
+    if tx_raw > 0:
+        dlnq_dDei_exp = (dD_dDei / (b_ * Di0_day)) * (ratio - 1.0)
+        dlnq_db_exp = -np.log(ratio) / b_ ** 2 - Dmin_day * tx / b_ + (dD_db / (b_ * Di0_day)) * (ratio - 1.0)
+    else:
+        dlnq_dDei_exp = 0.0
+        dlnq_db_exp = 0.0
+
+    for i in range(t_mo.size):
+        t_d = t_mo[i] * (365.0 / 12.0)
+        if t_d <= tx:
+            u = 1.0 + b_ * Di0_day * t_d
+            q = Qi * u ** (-1.0 / b_)
+            jac_out[i, 1] = q * (-t_d * dD_dDei / u)
+            jac_out[i, 2] = 0.0
+            jac_out[i, 3] = q * (np.log(u) / b_ ** 2 - (Di0_day * t_d + b_ * t_d * dD_db) / (b_ * u))
+        else:
+            q = qx * np.exp(-Dmin_day * (t_d - tx))
+            jac_out[i, 1] = q * dlnq_dDei_exp
+            jac_out[i, 2] = q * (-(t_d - tx) * dm_dDef)
+            jac_out[i, 3] = q * dlnq_db_exp
+        jac_out[i, 0] = q / Qi
+
+
 # numpy twin of arps_q_pt
 def arps_q_np(t_mo, Qi, Dei, Def, b):
+    if HAS_NUMBA:
+        t = np.asarray(t_mo, dtype=np.float64)
+        q = np.empty(t.size)
+        _arps_q_kernel(np.ascontiguousarray(t.ravel()), float(Qi), float(Dei), float(Def), float(b), q)
+        return q.reshape(t.shape)
     if np.isclose(Dei, Def):
         D_day = -np.log(1.0 - Dei) / 365.0
         t_d = np.asarray(t_mo, float) * (365.0 / 12.0)
@@ -148,6 +369,55 @@ def arps_q_np(t_mo, Qi, Dei, Def, b):
     return np.where(t_d <= tx, q_hyp, q_exp)
 
 
+# Analytic Jacobian of arps_q_np; columns are d/dQi, d/dDei, d/dDef, d/db
+def arps_q_np_jac(t_mo, Qi, Dei, Def, b):
+    if HAS_NUMBA:
+        t = np.asarray(t_mo, dtype=np.float64)
+        jac = np.empty((t.size, 4))
+        _arps_q_jac_kernel(np.ascontiguousarray(t.ravel()), float(Qi), float(Dei), float(Def), float(b), jac)
+        return jac.reshape(t.shape + (4,))
+    t_d = np.asarray(t_mo, float) * (365.0 / 12.0)
+    q = arps_q_np(t_mo, Qi, Dei, Def, b)
+    jac = np.zeros(t_d.shape + (4,), dtype=float)
+    jac[..., 0] = q / Qi
+    if np.isclose(Dei, Def):
+        jac[..., 1] = -q * t_d / (365.0 * (1.0 - Dei))
+        return jac
+    eps = 1e-8
+    b_ = np.maximum(b, eps)
+
+    g = np.power(1.0 - Dei, -b_)
+    Di0_day = ((g - 1.0) / b_) / 365.0
+    dD_dDei = np.power(1.0 - Dei, -b_ - 1.0) / 365.0
+    dD_db = (-g * np.log(1.0 - Dei) * b_ - (g - 1.0)) / (365.0 * b_ ** 2)
+    Dmin_day = -np.log(1.0 - Def) / 365.0
+    dm_dDef = 1.0 / (365.0 * (1.0 - Def))
+
+    tx_raw = (1.0 / Dmin_day - 1.0 / Di0_day) / b_
+    tx = np.maximum(tx_raw, 0.0)
+    hyp = t_d <= tx
+
+    # Hyperbolic segment: ln q = ln Qi - ln(u) / b, u = 1 + b D t
+    u = 1.0 + b_ * Di0_day * t_d
+    dlnq_dDei_hyp = -t_d * dD_dDei / u
+    dlnq_db_hyp = np.log(u) / b_ ** 2 - (Di0_day * t_d + b_ * t_d * dD_db) / (b_ * u)
+
+    # Exponential tail after the switch month tx (only Def matters if the switch is clamped at 0)
+    ratio = Dmin_day / Di0_day
+    if tx_raw > 0:
+        dlnq_dDei_exp = (dD_dDei / (b_ * Di0_day)) * (ratio - 1.0)
+        dlnq_db_exp = -np.log(ratio) / b_ ** 2 - Dmin_day * tx / b_ + (dD_db / (b_ * Di0_day)) * (ratio - 1.0)
+    else:
+        dlnq_dDei_exp = 0.0
+        dlnq_db_exp = 0.0
+    dlnq_dDef_exp = -(t_d - tx) * dm_dDef
+
+    jac[..., 1] = q * np.where(hyp, dlnq_dDei_hyp, dlnq_dDei_exp)
+    jac[..., 2] = q * np.where(hyp, 0.0, dlnq_dDef_exp)
+    jac[..., 3] = q * np.where(hyp, dlnq_db_hyp, dlnq_db_exp)
+    return jac
+
+
 # Fast warm-start helper for deterministic fits (tiny coarse grid)
 def _coarse_grid_best(t, q, Qi_guess, Dei_low, Dei_guess, Dei_high, b_low, b_guess, b_high, Def):
     """
@@ -527,10 +797,14 @@ def calc_goodness_of_fit(q_act, q_pred):
     if q_act.size < 2 or np.allclose(q_act, q_act[0]) or np.allclose(q_pred, q_pred[0]):
         r_squared = 0.0
     else:
-        r, _ = scipy.stats.pearsonr(q_act, q_pred)
-        r_squared = float(r * r)
-    rmse = float(np.sqrt(np.mean((q_act - q_pred)**2)))
-    mae = float(np.mean(np.abs(q_act - q_pred)))
+        # Squared Pearson r from centered dot products (same value as scipy.stats.pearsonr)
+        xa = q_act - q_act.mean()
+        xp = q_pred - q_pred.mean()
+        sxy = np.einsum('i,i->', xa, xp)
+        r_squared = float(min(sxy * sxy / (np.einsum('i,i->', xa, xa) * np.einsum('i,i->', xp, xp)), 1.0))
+    d = q_act - q_pred
+    rmse = float(np.sqrt(np.einsum('i,i->', d, d) / d.size))
+    mae = float(np.abs(d).mean())
     return r_squared, rmse, mae
 
 
@@ -642,11 +916,13 @@ def perform_curve_fit(  # noqa
         *,
         include_deterministics=False,
         log_likelihood=False,
-        return_trace=True
+        return_trace=True,
+        fast=False
     ):
     """
     Fit ARPS parameters to (t_act, q_act) using one of:
-    - 'curve_fit' (SciPy bounded least squares),
+    - 'curve_fit' (SciPy bounded least squares, finite-difference Jacobian),
+    - 'curve_fit_jac' (same, with the analytic Jacobian; the fast path),
     - 'monte_carlo' (PyMC NUTS or ADVI with bounded priors; likelihood on log-rates),
     - 'differential_evolution' (SciPy DE).
 
@@ -675,7 +951,7 @@ def perform_curve_fit(  # noqa
         aligned with `config["optimize"]`.
     config : dict
         {'optimize': [param names], 'fixed': {param: value}}
-    method : {'curve_fit','monte_carlo','differential_evolution'}
+    method : {'curve_fit','curve_fit_jac','monte_carlo','differential_evolution'}
     trials : int
         Iterations / draws depending on method.
     use_advi : bool
@@ -687,6 +963,11 @@ def perform_curve_fit(  # noqa
         If True, save log_likelihood in the trace.
     return_trace : bool
         If True, return the trace object from the model fitting.
+    fast : bool
+        If True, the SciPy least-squares solves stop at ftol=1e-5 (instead of 1e-8),
+        and the 'monte_carlo' curve_fit warm start skips its input NaN scan
+        (check_finite=False).  xtol/gtol stay at 1e-8, since a loose xtol can stop
+        early on steps clipped at a bound.  Off by default so reported fits don't shift.
 
     Returns
     -------
@@ -697,6 +978,7 @@ def perform_curve_fit(  # noqa
     """
     t_act = np.asarray(t_act, dtype=np.float64)
     q_act = np.clip(np.asarray(q_act, dtype=np.float64), 1e-9, None)
+    ls_ftol = 1e-5 if fast else 1e-8  # Relative cost-change stop for the SciPy least-squares solves
 
     # Validation shared by all methods
     valid_names = {"Qi", "Dei", "Def", "b"}
@@ -748,6 +1030,15 @@ def perform_curve_fit(  # noqa
     def arps_fit(t, Qi, Dei, b, Def):
         return arps_q_np(t, Qi, Dei, Def, b)
 
+    # Analytic Jacobian for curve_fit, columns in config["optimize"] order
+    jac_cols = [{"Qi": 0, "Dei": 1, "Def": 2, "b": 3}[n] for n in config["optimize"]]
+
+    def model_jac(t, *params):
+        p = dict(zip(config["optimize"], params))
+        p.update(config["fixed"])
+        J = arps_q_np_jac(t, p["Qi"], p["Dei"], p["Def"], p["b"])[:, jac_cols]
+        return np.nan_to_num(J, nan=0.0, posinf=1e12, neginf=-1e12)
+
     # arps_q_pt signature: arps_q_pt(t_mo, Qi, Dei, Def, b) -> q(t)
     def arps_fit_mc(t, Qi, Dei, b, Def):
         return arps_q_pt(t, Qi, Dei, Def, b)
@@ -859,7 +1150,10 @@ def perform_curve_fit(  # noqa
                 q_act,
                 p0=ig_arr,
                 bounds=(lo_vec, hi_vec),
+                jac=model_jac,
                 maxfev=max(trials, 4000),
+                check_finite=not fast,
+                ftol=ls_ftol,
             )
         except (RuntimeError, ValueError):
             curve_ok = False
@@ -1119,15 +1413,26 @@ def perform_curve_fit(  # noqa
             def wrapped_model_func_safe(t, *params):
                 y = wrapped_model_func(t, *params)
                 return np.nan_to_num(y, nan=1e12, posinf=1e12, neginf=0.0)
-            popt, _ = curve_fit(
-                wrapped_model_func_safe,
-                t_act,
-                q_act,
-                p0=ig_arr,
+            t_fit = np.asarray(t_act, float)
+            q_fit = np.asarray(q_act, float)
+
+            def residuals(params):
+                return wrapped_model_func_safe(t_fit, *params) - q_fit
+
+            # Same bounded TRF solve curve_fit runs, minus the covariance estimate we discard.
+            # Non-finite data still fails in least_squares' initial residual check.
+            res = least_squares(
+                residuals,
+                ig_arr,
+                jac=(lambda params: model_jac(t_fit, *params)) if method == 'curve_fit_jac' else '2-point',
                 bounds=(lo, hi),
-                maxfev=max(trials, 4000)
+                method='trf',
+                max_nfev=max(trials, 4000),
+                ftol=ls_ftol
             )
-            popt = np.clip(np.asarray(popt, float), lo, hi)
+            if not res.success:
+                raise RuntimeError(f"Optimal parameters not found: {res.message}")
+            popt = np.clip(res.x, lo, hi)
             return popt, True
         except (RuntimeError, ValueError) as e:
             # Differential evolution fallback for tough landscapes
@@ -410,11 +410,7 @@ def main():
     initial_guess = [Qi_guess, Dei_guess, b_guess]
     config = {'optimize': ['Qi', 'Dei', 'b'], 'fixed': {'Def': def_val}}
     
-    result = fcst.perform_curve_fit(t_act, q_act, initial_guess, bounds, config, method='curve_fit')
-    if isinstance(result, tuple) and len(result) > 1:
-        qi_fit, dei_fit, b_fit = result[0]
-    else:
-        qi_fit, dei_fit, b_fit = result
+    qi_fit, dei_fit, b_fit = fcst.perform_curve_fit(t_act, q_act, initial_guess, bounds, config, method='curve_fit')[0]
     
     fit_pass, fit_tests, r2, rmse = validate_fitted_curve(df_well, qi_fit, dei_fit, b_fit, def_val)
     
@@ -79,7 +79,7 @@ def normalize_fit_method(m: str, default: str = 'curve_fit') -> str:
     if m is None or (isinstance(m, float) and pd.isna(m)):
         return default
     m = str(m).strip().lower()
-    return m if m in {'curve_fit','monte_carlo','differential_evolution'} else default
+    return m if m in {'curve_fit','curve_fit_jac','monte_carlo','differential_evolution'} else default
 
 # Read method config
 default_fit_method = normalize_fit_method(method_params.get('setting', 'curve_fit'), 'curve_fit')
@@ -356,7 +356,7 @@ def fit_arps_curve(
         Must contain columns: ['WellID','Measure','Date','MonthsProducing', value_col, 'segment'].
     value_col : str
         Name of the rate column to fit (e.g., 'OilRate').
-    method : {'curve_fit','monte_carlo','differential_evolution'}, default 'curve_fit'
+    method : {'curve_fit','curve_fit_jac','monte_carlo','differential_evolution'}, default 'curve_fit'
         Fitting backend. The 'monte_carlo' backend uses PyMC with NUTS/ADVI.
         If 'monte_carlo' is selected, an internal warm-start via SciPy is used and,
         when that warm-start yields Dei ≈ Def, sampling is skipped by design.
@@ -572,7 +572,7 @@ def fit_arps_curve(
             raise RuntimeError("auto_fit1 failed")
         qi_fit, Dei_fit, b_fit = optimized_params
         # Fitting the curve
-        q_pred = fcst.varps_decline(1, 1, qi_fit, Dei_fit, def_dict[phase], b_fit, t_act, 0, 0)[3]
+        q_pred = fcst.arps_decline_nb(1, 1, qi_fit, Dei_fit, def_dict[phase], b_fit, t_act, 0, 0)[3]
         with warnings.catch_warnings():
             warnings.simplefilter('ignore')
             r_squared, rmse, mae = fcst.calc_goodness_of_fit(q_act, q_pred)
@@ -594,7 +594,7 @@ def fit_arps_curve(
             raise RuntimeError("auto_fit2 failed")
         Dei_fit = float(optimized_params[0])
         # Fitting the curve
-        q_pred = fcst.varps_decline(1, 1, Qi_guess, Dei_fit, def_dict[phase], b_guess, t_act, 0, 0)[3]
+        q_pred = fcst.arps_decline_nb(1, 1, Qi_guess, Dei_fit, def_dict[phase], b_guess, t_act, 0, 0)[3]
         with warnings.catch_warnings():
             warnings.simplefilter('ignore')
             r_squared, rmse, mae = fcst.calc_goodness_of_fit(q_act, q_pred)
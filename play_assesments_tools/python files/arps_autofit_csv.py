@@ -11,15 +11,15 @@ import pandas as pd
 import numpy as np
 import warnings
 from pathlib import Path
+from joblib import Memory, Parallel, delayed
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from AnalyticsAndDBScripts.csv_loader import CSVDataLoader
+from AnalyticsAndDBScripts.csv_loader import CSVDataLoader, MEASURE_DTYPE
 from config.config_loader import get_config
 import AnalyticsAndDBScripts.prod_fcst_functions as fcst
 import AnalyticsAndDBScripts.arps_validation as arps_val
-import warnings
 
 warnings.filterwarnings('ignore')
 
@@ -60,6 +60,29 @@ param_df_cols = [
     'StartMonth', 'Q_guess', 'Q3', 'Dei', 'b_factor', 'R_squared', 'RMSE', 'MAE'
 ]
 
+# Explicit dtypes for the fitted-parameter columns
+param_df_dtypes = {
+    'Measure': MEASURE_DTYPE,
+    'Q_guess': np.float32,
+    'Q3': np.float32,
+    'Dei': np.float32,
+    'b_factor': np.float32,
+    'R_squared': np.float32,
+    'RMSE': np.float32,
+    'MAE': np.float32
+}
+
+# Record layout for preallocated result buffers: metrics unboxed as float64, the rest as objects
+param_record_dtype = np.dtype([
+    (col, np.float64 if col in ('Q_guess', 'Q3', 'Dei', 'b_factor', 'R_squared', 'RMSE', 'MAE') else object)
+    for col in param_df_cols
+])
+
+
+def results_to_df(records):
+    """Build the typed results DataFrame from a filled param_record_dtype buffer."""
+    return pd.DataFrame.from_records(records).infer_objects().astype(param_df_dtypes)
+
 
 def calc_months_producing(group):
     """Add MonthsProducing column to production data."""
@@ -149,7 +172,8 @@ def fit_arps_curve(
         (prod_df_cleaned['Measure'] == phase)
     ].sort_values(by='Date')
 
-    df['month_int'] = df['Date'].rank(method='dense', ascending=True)
+    # Dense date rank via NumPy (same values as Date.rank(method='dense'))
+    df['month_int'] = np.unique(df['Date'].to_numpy(), return_inverse=True)[1] + 1.0
     min_length = 12
 
     # Select segment
@@ -187,7 +211,9 @@ def fit_arps_curve(
     arr_length = len(df)
     # CRITICAL: Time must start at 0 for ARPS equations
     # t=0 corresponds to the FIRST data point, where q(0) = Qi
-    t_act = df['Date'].rank(method='min', ascending=True).to_numpy() - 1
+    # Same values as Date.rank(method='min') - 1, without the pandas rank machinery
+    dates = df['Date'].to_numpy()
+    t_act = np.searchsorted(np.sort(dates), dates).astype(np.float64)
     q_act = df[value_col].to_numpy()
     start_date = df['Date'].min()
     start_month = df['month_int'].min()
@@ -214,14 +240,10 @@ def fit_arps_curve(
             t_act, q_act, initial_guess, bounds, 
             config_optimize_dei_b, method=method, trials=trials
         )
-        # Handle different return formats
-        if isinstance(result, tuple):
-            optimized_params = result[0] if len(result) > 1 else result
-        else:
-            optimized_params = result
+        optimized_params = result[0]  # (params, success[, trace])
         Dei_fit, b_fit = optimized_params
         qi_fit = Qi_guess  # Qi is fixed, not optimized
-        q_pred = fcst.varps_decline(1, 1, qi_fit, Dei_fit, def_dict[phase], b_fit, t_act, 0, 0)[3]
+        q_pred = fcst.arps_decline_nb(1, 1, qi_fit, Dei_fit, def_dict[phase], b_fit, t_act, 0, 0)[3]
         with warnings.catch_warnings():
             warnings.simplefilter('ignore')
             r_squared, rmse, mae = fcst.calc_goodness_of_fit(q_act, q_pred)
@@ -248,13 +270,9 @@ def fit_arps_curve(
             t_act, q_act, initial_guess, bounds, 
             config_optimize_dei, method=method, trials=trials
         )
-        # Handle different return formats
-        if isinstance(result, tuple):
-            optimized_params = result[0] if len(result) > 1 else result
-        else:
-            optimized_params = result
+        optimized_params = result[0]  # (params, success[, trace])
         Dei_fit = optimized_params[0]
-        q_pred = fcst.varps_decline(1, 1, Qi_guess, Dei_fit, def_dict[phase], b_dict['guess'], t_act, 0, 0)[3]
+        q_pred = fcst.arps_decline_nb(1, 1, Qi_guess, Dei_fit, def_dict[phase], b_dict['guess'], t_act, 0, 0)[3]
         with warnings.catch_warnings():
             warnings.simplefilter('ignore')
             r_squared, rmse, mae = fcst.calc_goodness_of_fit(q_act, q_pred)
@@ -371,38 +389,28 @@ def fit_aggregate_arps_curve(
     if time_normalize:
         # Time-normalize: shift each well to start at Month 0
         # This is the proper way to create type curves with staggered starts
-        debug_msg(f"⏱️ Time-normalizing {len(df['WellID'].unique())} wells")
-        normalized_data = []
-        for well_id in df['WellID'].unique():
-            well_df = df[df['WellID'] == well_id].copy()
-            debug_msg(f"  Well {well_id}: {len(well_df)} rows")
-            well_df = well_df.sort_values('Date')
-            well_min_date = well_df['Date'].min()
-            well_df['months_from_start'] = ((well_df['Date'] - well_min_date).dt.days / 30.42).astype(int)
-            debug_msg(f"  Well {well_id} months range: {well_df['months_from_start'].min()} to {well_df['months_from_start'].max()}")
-            normalized_data.append(well_df)
-        
-        if len(normalized_data) == 0:
-            debug_msg(f"❌ No normalized data created!")
-            return None, None
-        
-        df = pd.concat(normalized_data, ignore_index=True)
-        debug_msg(f"✅ After concat: {len(df)} rows")
+        debug_msg(f"⏱️ Time-normalizing {df['WellID'].nunique()} wells")
+        df = df.sort_values(['WellID', 'Date'], ignore_index=True)
+        well_min_date = df.groupby('WellID')['Date'].transform('min')
+        df['months_from_start'] = ((df['Date'] - well_min_date).dt.days / 30.42).astype(int)
+        debug_msg(f"✅ Normalized months range: {df['months_from_start'].min()} to {df['months_from_start'].max()}")
     else:
         # Calendar time: assign month index starting from earliest date across all wells
         df['months_from_start'] = ((df['Date'] - min_date).dt.days / 30.42).astype(int)
     
     # Average production across all wells for each month
     # This is the key step for type curve analysis
-    aggregated = df.groupby('months_from_start').agg({
-        value_col: 'mean',  # Average production
-        'WellID': 'count'   # Number of wells contributing
-    }).reset_index()
-    
-    aggregated.rename(columns={
-        value_col: 'avg_production',
-        'WellID': 'well_count'
-    }, inplace=True)
+    # months_from_start is a small non-negative int index, so bincount sums and counts
+    # every month in one pass over contiguous arrays; months without data are dropped
+    months = df['months_from_start'].to_numpy()
+    well_count = np.bincount(months)  # Number of wells contributing
+    month_sum = np.bincount(months, weights=df[value_col].to_numpy(dtype=np.float64))
+    has_data = well_count > 0
+    aggregated = pd.DataFrame({
+        'months_from_start': np.flatnonzero(has_data),
+        'avg_production': month_sum[has_data] / well_count[has_data],  # Average production
+        'well_count': well_count[has_data],
+    })
     
     # Prepare fitting data
     t_act = aggregated['months_from_start'].to_numpy()
@@ -444,11 +452,7 @@ def fit_aggregate_arps_curve(
             config_optimize_dei_b, method=method, trials=trials
         )
         
-        # Handle different return formats
-        if isinstance(result, tuple):
-            optimized_params = result[0] if len(result) > 1 else result
-        else:
-            optimized_params = result
+        optimized_params = result[0]  # (params, success[, trace])
         
         Dei_fit, b_fit = optimized_params
         qi_fit = Qi_guess
@@ -457,7 +461,7 @@ def fit_aggregate_arps_curve(
         assert qi_fit == Qi_guess, f"CRITICAL ERROR: Qi was modified! Expected {Qi_guess}, got {qi_fit}"
         
         # Calculate predicted values
-        q_pred = fcst.varps_decline(1, 1, qi_fit, Dei_fit, def_dict[measure], b_fit, t_act, 0, 0)[3]
+        q_pred = fcst.arps_decline_nb(1, 1, qi_fit, Dei_fit, def_dict[measure], b_fit, t_act, 0, 0)[3]
         
         with warnings.catch_warnings():
             warnings.simplefilter('ignore')
@@ -501,6 +505,63 @@ def fit_aggregate_arps_curve(
         return None, aggregated
 
 
+# On-disk memo for aggregate fits, so re-running a script on unchanged data skips the fit.
+# Script-side only: the Streamlit app memoizes the same call itself (fit_aggregate_cached).
+# Lives in $ARPS_CACHE_DIR, else .arps_cache next to this module; created on first use.
+AGGREGATE_CACHE_ENV = 'ARPS_CACHE_DIR'
+# Above this many rows hashing the frame (and storing the aggregate) isn't worth it; fit directly
+AGGREGATE_CACHE_MAX_ROWS = 2_000_000
+_aggregate_memo = None
+
+
+def _fit_aggregate_memo(code_mtimes, data_key, prod_df_all_wells, measure, **kwargs):
+    # code_mtimes and data_key only key the entry: editing the fitting code invalidates old
+    # results, and the frame itself is keyed by content (pickling it would also hash pandas'
+    # internal caches, which change once the frame has been used)
+    return fit_aggregate_arps_curve(prod_df_all_wells, measure, **kwargs)
+
+
+def get_aggregate_memo():
+    """
+    joblib-memoized _fit_aggregate_memo, created on first call.
+    
+    Returns:
+        MemorizedFunc: Cached fit; .clear() empties the on-disk cache
+    """
+    global _aggregate_memo
+    if _aggregate_memo is None:
+        cache_dir = os.environ.get(AGGREGATE_CACHE_ENV) or Path(__file__).parent / '.arps_cache'
+        memory = Memory(cache_dir, verbose=0)
+        _aggregate_memo = memory.cache(_fit_aggregate_memo, ignore=['prod_df_all_wells'])
+    return _aggregate_memo
+
+
+def fit_aggregate_arps_curve_cached(prod_df_all_wells, measure, **kwargs):
+    """
+    fit_aggregate_arps_curve memoized on disk (joblib.Memory, see get_aggregate_memo).
+    
+    Keyed on the production rows' content (row hashes, columns and dtypes), measure,
+    fit settings and the modification times of this module and prod_fcst_functions.
+    
+    Args:
+        prod_df_all_wells: DataFrame with all wells' production data
+        measure: Product type (OIL/GAS/WATER)
+        **kwargs: Remaining fit_aggregate_arps_curve arguments (no debug_output)
+        
+    Returns:
+        Tuple: (result_list, aggregated_df), as fit_aggregate_arps_curve
+    """
+    if len(prod_df_all_wells) > AGGREGATE_CACHE_MAX_ROWS:
+        return fit_aggregate_arps_curve(prod_df_all_wells, measure, **kwargs)
+    code_mtimes = (os.path.getmtime(__file__), os.path.getmtime(fcst.__file__))
+    data_key = (
+        tuple(prod_df_all_wells.columns),
+        tuple(map(str, prod_df_all_wells.dtypes)),
+        pd.util.hash_pandas_object(prod_df_all_wells, index=False).to_numpy(),
+    )
+    return get_aggregate_memo()(code_mtimes, data_key, prod_df_all_wells, measure, **kwargs)
+
+
 def process_well_csv(
     wellid, 
     measure, 
@@ -538,14 +599,14 @@ def process_well_csv(
     # Add MonthsProducing column
     with warnings.catch_warnings():
         warnings.simplefilter('ignore')
-        prod_df = prod_df.groupby(['WellID', 'Measure']).apply(calc_months_producing)
+        prod_df = prod_df.groupby(['WellID', 'Measure'], observed=True).apply(calc_months_producing)
         prod_df.reset_index(inplace=True, drop=True)
     
     # Apply Bourdet outliers
     if bourdet_params['setting']:
         with warnings.catch_warnings():
             warnings.simplefilter('ignore')
-            grouped = prod_df.groupby(['WellID', 'Measure'])
+            grouped = prod_df.groupby(['WellID', 'Measure'], observed=True)
             prod_df_cleaned = grouped.apply(apply_bourdet_outliers, 'MonthsProducing', value_col)
             prod_df_cleaned.reset_index(inplace=True, drop=True)
     else:
@@ -586,6 +647,83 @@ def process_well_csv(
     return result
 
 
+def process_well_batch_csv(wells, csv_loader, fit_method=None):
+    """
+    Process a batch of wells in one worker.
+    
+    Args:
+        wells: List of (WellID, Measure, LastProdDate, FitMethod) tuples
+        csv_loader: CSVDataLoader instance (ideally a subset() for these wells)
+        fit_method: Fitting method for every well; None uses each well's FitMethod
+        
+    Returns:
+        List of (wellid, measure, result, error) tuples; result is None and
+        error holds the message when a well fails
+    """
+    batch_results = []
+    for wellid, measure, last_prod_date, well_fit_method in wells:
+        try:
+            result = process_well_csv(
+                wellid=wellid,
+                measure=measure,
+                last_prod_date=last_prod_date,
+                csv_loader=csv_loader,
+                fit_method=fit_method or well_fit_method or 'curve_fit'
+            )
+            batch_results.append((wellid, measure, result, None))
+        except Exception as e:
+            batch_results.append((wellid, measure, None, str(e)))
+    return batch_results
+
+
+def iter_well_batches(well_list_df, csv_loader, fit_method=None, n_jobs=-1):
+    """
+    Fit all wells in parallel, yielding each batch as it completes.
+    
+    Wells are split into a few contiguous batches per worker so each task
+    ships only its own wells' production rows (via csv_loader.subset())
+    instead of pickling the whole dataset for every well.
+    
+    Args:
+        well_list_df: DataFrame with WellID, Measure, LastProdDate and
+            optionally FitMethod
+        csv_loader: CSVDataLoader instance
+        fit_method: Fitting method for every well; None uses each well's FitMethod
+        n_jobs: Number of worker processes (-1 for all cores)
+        
+    Yields:
+        (wells_done, batch_results) after each batch, in submission order
+    """
+    if n_jobs is None or n_jobs < 1:
+        n_jobs = os.cpu_count() or 1
+    total_wells = len(well_list_df)
+    if total_wells == 0:
+        return
+    
+    fit_methods = well_list_df['FitMethod'] if 'FitMethod' in well_list_df.columns else [None] * total_wells
+    wells = list(zip(
+        well_list_df['WellID'], well_list_df['Measure'].astype(str),
+        well_list_df['LastProdDate'], fit_methods
+    ))
+    
+    # Don't spin up workers for a handful of wells
+    n_jobs = min(n_jobs, max(1, total_wells // 4))
+    n_batches = min(total_wells, n_jobs * 4)
+    bounds = np.linspace(0, total_wells, n_batches + 1).astype(int)
+    batches = [wells[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+    
+    tasks = (
+        delayed(process_well_batch_csv)(
+            batch, csv_loader.subset({w[0] for w in batch}), fit_method
+        )
+        for batch in batches
+    )
+    wells_done = 0
+    for batch_results in Parallel(n_jobs=n_jobs, return_as='generator')(tasks):
+        wells_done += len(batch_results)
+        yield wells_done, batch_results
+
+
 def main(production_csv, well_list_csv=None, output_csv='arps_results_csv.csv'):
     """
     Main function to process wells from CSV files.
@@ -607,24 +745,19 @@ def main(production_csv, well_list_csv=None, output_csv='arps_results_csv.csv'):
     well_list_df = csv_loader.load_well_list()
     print(f"\nProcessing {len(well_list_df)} well/measure combinations...")
     
-    # Process each well
-    results = []
-    for idx, row in well_list_df.iterrows():
-        try:
-            result = process_well_csv(
-                wellid=row['WellID'],
-                measure=row['Measure'],
-                last_prod_date=row['LastProdDate'],
-                csv_loader=csv_loader,
-                fit_method=row.get('FitMethod', 'curve_fit')
-            )
-            results.append(result)
-        except Exception as e:
-            print(f"  ✗ Error: {e}")
-            continue
+    # Process wells in parallel batches, filling a preallocated record buffer
+    results = np.empty(len(well_list_df), dtype=param_record_dtype)
+    n_filled = 0
+    for _, batch_results in iter_well_batches(well_list_df, csv_loader):
+        for wellid, measure, result, error in batch_results:
+            if error is not None:
+                print(f"  ✗ Error (Well {wellid} - {measure}): {error}")
+                continue
+            results[n_filled] = tuple(result)
+            n_filled += 1
     
     # Create results DataFrame
-    results_df = pd.DataFrame(results, columns=param_df_cols)
+    results_df = results_to_df(results[:n_filled])
     
     # Save results
     results_df.to_csv(output_csv, index=False)
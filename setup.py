@@ -16,6 +16,7 @@ install_requires = [
     "numpy>=1.23",
     "pandas>=1.5",
     "scipy>=1.10",
+    "joblib>=1.3",
     "sqlalchemy>=2.0",
     "PyYAML>=6.0",
 ]
@@ -6,13 +6,19 @@ with interactive visualizations and parameter controls.
 """
 
 import streamlit as st
+import streamlit.components.v1 as components
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+from pyarrow import feather as pafeather
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import sys
 from pathlib import Path
 import io
+import gzip
+import hashlib
+import importlib.util
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
@@ -22,6 +28,34 @@ from AnalyticsAndDBScripts.visualization_utils import plot_decline_curve
 import AnalyticsAndDBScripts.prod_fcst_functions as fcst
 from config.config_loader import get_config
 
+CONFIG_PATH = Path(__file__).parent / 'config' / 'analytics_config.yaml'
+ARPS_MODULE_PATH = Path(__file__).parent / "play_assesments_tools" / "python files" / "arps_autofit_csv.py"
+
+
+# No spinner: this runs before st.set_page_config, which must be the first page element
+@st.cache_data(show_spinner=False)
+def load_decline_config(path: str, mtime: float):
+    """
+    Parse the decline_curve config section once per file version.
+    
+    Args:
+        path: Path to the YAML config
+        mtime: File modification time; part of the cache key so edits are picked up
+        
+    Returns:
+        Dict of decline_curve parameter entries keyed by their 'name'
+    """
+    return {item['name']: item for item in get_config('decline_curve', path=path)}
+
+
+def get_decline_config():
+    """Cached decline_curve config for CONFIG_PATH, keyed by entry name."""
+    return load_decline_config(str(CONFIG_PATH), CONFIG_PATH.stat().st_mtime)
+
+
+# Terminal decline (Def) by measure, from the same config entry arps_autofit_csv reads into def_dict
+DEF_VAL_BY_MEASURE = get_decline_config()['arps_parameters']['terminal_decline']
+
 # Page configuration
 st.set_page_config(
     page_title="Arps Decline Curve Analyzer",
@@ -31,7 +65,7 @@ st.set_page_config(
 )
 
 # Custom CSS - Professional Corporate Design v2.0
-st.markdown("""
+_CSS = """
 <style>
     /* Professional Blue Palette - Updated */
     /* Import ExxonMobil-style fonts */
@@ -420,7 +454,48 @@ st.markdown("""
         }
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Emitted on every run on purpose: Streamlit drops elements a rerun doesn't produce,
+# so a one-time injection guarded by session_state would lose the styling
+st.markdown(_CSS, unsafe_allow_html=True)
+
+# Static help text (About expander and Upload page)
+_ABOUT_MD = """
+This application performs Arps decline curve analysis on oil and gas production data.
+
+**Features:**
+- Upload CSV production data
+- Automatic data validation
+- Interactive decline curve fitting
+- Adjustable parameters
+- Export results
+
+**Required CSV Format:**
+- WellID (integer)
+- Measure (OIL/GAS/WATER)
+- Date (YYYY-MM-DD)
+- Value (production volume)
+- ProducingDays (optional)
+"""
+
+_REQUIRED_COLUMNS_MD = """
+**Required Columns:**
+- `WellID` (integer)
+- `Measure` (OIL/GAS/WATER)
+- `Date` (YYYY-MM-DD)
+- `Value` (float)
+
+**Optional:**
+- `ProducingDays` (integer)
+"""
+
+_EXAMPLE_CSV = """
+WellID,Measure,Date,Value,ProducingDays
+12345678901,OIL,2023-01-01,150.5,30
+12345678901,GAS,2023-01-01,450.0,30
+12345678901,WATER,2023-01-01,50.0,30
+"""
 
 # Helper functions
 def get_default_index(selected_value, available_values):
@@ -443,19 +518,380 @@ def get_default_index(selected_value, available_values):
         return 0
 
 
+@st.cache_resource(show_spinner=False)
+def load_arps_module(mtime):
+    """
+    Import arps_autofit_csv once and share it across reruns and sessions.
+    
+    Args:
+        mtime: Modification time of ARPS_MODULE_PATH; a new value re-imports the edited file
+        
+    Returns:
+        The executed arps_autofit_csv module
+    """
+    spec = importlib.util.spec_from_file_location("arps_autofit_csv", ARPS_MODULE_PATH)
+    arps_module = importlib.util.module_from_spec(spec)
+    # Register by name (and expose its folder) so parallel workers can import it
+    sys.modules["arps_autofit_csv"] = arps_module
+    arps_dir = str(ARPS_MODULE_PATH.parent)
+    if arps_dir not in sys.path:
+        sys.path.append(arps_dir)
+    spec.loader.exec_module(arps_module)
+    return arps_module
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def fit_aggregate_cached(_arps_module, _prod_df, data_key, measure, fit_method, time_normalize):
+    """
+    Memoized fit_aggregate_arps_curve for one measure, so unchanged re-runs are free.
+    
+    Args:
+        _arps_module: Loaded arps_autofit_csv module (not hashed)
+        _prod_df: Production data for all wells, or just this measure's rows
+            (not hashed; data_key stands in for it)
+        data_key: (production data fingerprint, arps_autofit_csv and prod_fcst_functions
+            mtimes) identifying the inputs
+        measure: Product type (OIL/GAS/WATER)
+        fit_method: Fitting method
+        time_normalize: Shift each well to Month 0 before aggregating
+        
+    Returns:
+        tuple: (result list or None, aggregated DataFrame or None)
+    """
+    return _arps_module.fit_aggregate_arps_curve(
+        prod_df_all_wells=_prod_df,
+        measure=measure,
+        value_col='Value',
+        dei_dict=_arps_module.dei_dict1,
+        def_dict=_arps_module.def_dict,
+        b_dict=_arps_module.default_b_dict[measure],
+        method=fit_method,
+        trials=_arps_module.trials,
+        smoothing_factor=_arps_module.smoothing_params['factor'],
+        time_normalize=time_normalize
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def get_well_history(_csv_loader, data_key, wellid, measure, last_prod_date, fit_months=120):
+    """
+    Cached CSVDataLoader.get_well_production for the Visualize page.
+    Chart-option reruns on the same well reuse the filtered history.
+    
+    Args:
+        _csv_loader: CSVDataLoader for the current upload (not hashed)
+        data_key: Production data fingerprint standing in for the loader
+        wellid: Well ID
+        measure: Product type (OIL/GAS/WATER)
+        last_prod_date: Last production date for the well
+        fit_months: Months of history to return
+        
+    Returns:
+        DataFrame: WellID, Measure, Date, Value
+    """
+    return _csv_loader.get_well_production(
+        wellid=wellid,
+        measure=measure,
+        last_prod_date=last_prod_date,
+        fit_months=fit_months
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def forecast_rate(q3, dei, def_val, b, n_months):
+    """
+    Monthly Arps rate for one fit, memoized on its parameters.
+    Toggling chart options on the Visualize page reuses the curve.
+    
+    Args:
+        q3: Initial rate
+        dei: Initial effective annual decline
+        def_val: Terminal decline
+        b: b-factor
+        n_months: Number of months (history + forecast) starting at month 0
+        
+    Returns:
+        np.ndarray: Rate for months 0..n_months-1
+    """
+    t_months = np.arange(0, n_months)
+    return fcst.arps_decline_nb(1, 1, q3, dei, def_val, b, t_months, 0, 0)[3]
+
+
+def downsample_log(df, n=200):
+    """
+    Thin a well's history to at most ~n rows, spaced log-uniformly in time.
+    Keeps the steep early decline dense and the flat tail sparse.
+    
+    Args:
+        df: Time-sorted DataFrame of one well's production
+        n: Target number of points
+        
+    Returns:
+        DataFrame: Subset of df rows (first and last rows always kept)
+    """
+    idx = np.unique(np.rint(np.geomspace(1, len(df), n)).astype(int)) - 1
+    return df.iloc[idx]
+
+
+def wells_scatter_trace(df, x_col, opacity):
+    """
+    Plot every well's points as one WebGL marker trace instead of a trace per well.
+    
+    Args:
+        df: Per-well production rows with x_col, WellID and Value
+        x_col: Column for the x axis ('Date' or 'months_from_start')
+        opacity: Marker opacity
+        
+    Returns:
+        go.Scattergl: Single trace colored by well, with the WellID in the hover
+    """
+    well_codes, _ = pd.factorize(df['WellID'], sort=True)
+    x_label = 'Month' if x_col == 'months_from_start' else 'Date'
+    return go.Scattergl(
+        x=df[x_col].to_numpy(),
+        y=df['Value'].to_numpy(dtype=np.float32),
+        mode='markers',
+        name='Wells',
+        marker=dict(size=6, opacity=opacity, color=well_codes, colorscale='Viridis'),
+        customdata=df['WellID'].to_numpy(),
+        showlegend=False,
+        hovertemplate=f'Well %{{customdata}}<br>{x_label}: %{{x}}<br>Rate: %{{y:.1f}}<extra></extra>'
+    )
+
+
+@st.cache_resource(max_entries=4)
+def load_uploaded_csv(file_bytes):
+    """
+    Parse and validate an uploaded production CSV (cached on the file bytes).
+    Reruns and page switches with the same upload skip the reparse. Cached as a resource,
+    so every hit shares the same loader and frames instead of unpickling a copy; treat
+    them as read-only.
+    
+    Args:
+        file_bytes: Raw contents of the uploaded CSV
+        
+    Returns:
+        tuple: (CSVDataLoader, production DataFrame, well list DataFrame, data quality issues dict,
+        data stats dict of the well/measure counts the pages display)
+    """
+    csv_loader = CSVDataLoader(io.BytesIO(file_bytes))
+    production_df = csv_loader.load_production_data()
+    well_list_df = csv_loader.load_well_list()
+    issues = csv_loader.validate_data_quality()
+    # Counts shown on Upload/Run Analysis; computed once here instead of on every rerun
+    measure_counts = well_list_df['Measure'].value_counts()
+    stats = {
+        'production_wells': production_df['WellID'].nunique(),
+        'production_measures': production_df['Measure'].nunique(),
+        'date_range_days': (production_df['Date'].max() - production_df['Date'].min()).days,
+        'well_list_wells': well_list_df['WellID'].nunique(),
+        'measures': [str(m) for m in well_list_df['Measure'].unique()],
+        'measure_counts': measure_counts[measure_counts > 0].to_dict(),
+        # Stand-in for the full frame in downstream cache keys (row order matters)
+        'fingerprint': hashlib.sha1(
+            pd.util.hash_pandas_object(production_df, index=False).to_numpy().tobytes()
+        ).hexdigest(),
+    }
+    return csv_loader, production_df, well_list_df, issues, stats
+
+@st.cache_data
+def build_forecast_df(results_df, forecast_months=60):
+    """
+    Forecast every fitted well/measure for forecast_months months.
+    Cached on the results, so Export reruns don't recompute it.
+    
+    Args:
+        results_df: Fitted parameters (one row per well/measure)
+        forecast_months: Months to forecast beyond month 0
+        
+    Returns:
+        DataFrame: Long-form WellID, Measure, Month, Rate, Cumulative
+        (empty if no row has a complete set of fitted parameters)
+    """
+    # Failed fits carry NaN parameters; leave them out of the forecast
+    results_df = results_df[results_df[['Q3', 'Dei', 'b_factor']].notna().all(axis=1)]
+    t_months = np.arange(0, forecast_months + 1)
+    def_vals = results_df['Measure'].map(DEF_VAL_BY_MEASURE).astype(np.float64).fillna(0.08).to_numpy()
+    rate, cum = fcst.varps_decline_many(
+        results_df['Q3'].to_numpy(),
+        results_df['Dei'].to_numpy(),
+        def_vals,
+        results_df['b_factor'].to_numpy(),
+        t_months
+    )
+    
+    # Monthly forecast doesn't need 64-bit precision; halves memory and export bytes
+    forecast_df = pd.DataFrame({
+        'WellID': np.repeat(results_df['WellID'].to_numpy(), len(t_months)),
+        'Measure': pd.Categorical(np.repeat(results_df['Measure'].to_numpy(), len(t_months))),
+        'Month': np.tile(t_months.astype(np.int16), len(results_df)),
+        'Rate': rate.ravel().astype(np.float32),
+        'Cumulative': cum.ravel().astype(np.float32)
+    })
+    return forecast_df
+
+
+@st.cache_data
+def to_csv_bytes(df):
+    """
+    Encode a DataFrame as CSV bytes for st.download_button (cached).
+    
+    Args:
+        df: DataFrame to export
+        
+    Returns:
+        bytes: UTF-8 CSV without the index
+    """
+    return df.to_csv(index=False).encode('utf-8')
+
+
+@st.cache_data
+def to_csv_gz_bytes(df):
+    """
+    Encode a DataFrame as gzip-compressed CSV bytes (cached).
+    
+    Args:
+        df: DataFrame to export
+        
+    Returns:
+        bytes: gzip file contents
+    """
+    return gzip.compress(to_csv_bytes(df), compresslevel=5)
+
+@st.cache_data
+def to_parquet_bytes(df):
+    """
+    Encode a DataFrame as snappy-compressed Parquet bytes (cached).
+    
+    Args:
+        df: DataFrame to export
+        
+    Returns:
+        bytes: Parquet file contents
+    """
+    buf = io.BytesIO()
+    df.to_parquet(buf, engine='pyarrow', compression='snappy', index=False)
+    return buf.getvalue()
+
+
+@st.cache_data
+def to_feather_bytes(df):
+    """
+    Encode a DataFrame as Feather (Arrow IPC) bytes (cached).
+    
+    Args:
+        df: DataFrame to export
+        
+    Returns:
+        bytes: Feather file contents
+    """
+    buf = io.BytesIO()
+    pafeather.write_feather(pa.Table.from_pandas(df, preserve_index=False), buf)
+    return buf.getvalue()
+
+@st.cache_data
+def build_forecast_exports(results_df, forecast_months=60, sample_months=24):
+    """
+    Build every forecast artifact the Export page needs in one cached call.
+    Keyed on the (small) results frame only, so reruns never rehash the
+    N x forecast_months forecast frame the way per-format cached calls would.
+    
+    Args:
+        results_df: Fitted parameters (one row per well/measure)
+        forecast_months: Months to forecast beyond month 0
+        sample_months: Rows of the first well's forecast kept for the preview tab
+        
+    Returns:
+        dict or None: 'csv_gz' and 'parquet' bytes plus 'sample' (first well's
+        Month/Rate/Cumulative, possibly empty); None if nothing could be forecast
+    """
+    if results_df.empty:
+        return None
+    forecast_df = build_forecast_df(results_df, forecast_months)
+    if forecast_df.empty:
+        return None
+    
+    first = results_df.iloc[0]
+    sample_mask = (forecast_df['WellID'] == first['WellID']) & (forecast_df['Measure'] == first['Measure'])
+    return {
+        # Numeric forecast CSV compresses ~5-10x; gzip it for the download
+        'csv_gz': to_csv_gz_bytes(forecast_df),
+        'parquet': to_parquet_bytes(forecast_df),
+        'sample': forecast_df.loc[sample_mask, ['Month', 'Rate', 'Cumulative']].head(sample_months).reset_index(drop=True),
+    }
+
+
+@st.cache_data
+def build_summary_report(results_df):
+    """
+    Build the plain-text analysis summary report as UTF-8 bytes (cached).
+    
+    Args:
+        results_df: Fitted parameters (one row per well/measure)
+        
+    Returns:
+        bytes: Report text, ready for st.download_button
+    """
+    r2 = results_df['R_squared'].dropna().to_numpy()
+    r2_avg, r2_min, r2_max = (f"{stat(r2):.3f}" if r2.size else "n/a" for stat in (np.mean, np.min, np.max))
+    # One pass over R²: bin against the thresholds, then n_above[i] counts fits with R² > thresholds[i - 1]
+    n_above = np.bincount(np.searchsorted([0.7, 0.8, 0.9], r2), minlength=4)[::-1].cumsum()[::-1]
+    by_measure = results_df.groupby('Measure', observed=True).agg(
+        count=('WellID', 'size'),
+        r2_mean=('R_squared', 'mean'),
+        qi_mean=('Q3', 'mean'),
+        dei_mean=('Dei', 'mean'),
+        b_mean=('b_factor', 'mean')
+    )
+    per_measure = "\n".join(
+        f"\n{m}:\n"
+        f"  Count: {by_measure.at[m, 'count']}\n"
+        f"  Avg R²: {by_measure.at[m, 'r2_mean']:.3f}\n"
+        f"  Avg Qi: {by_measure.at[m, 'qi_mean']:.1f}\n"
+        f"  Avg Dei: {by_measure.at[m, 'dei_mean']:.3f}\n"
+        f"  Avg b-factor: {by_measure.at[m, 'b_mean']:.3f}"
+        for m in ['OIL', 'GAS', 'WATER'] if m in by_measure.index
+    )
+    return f"""ARPS DECLINE CURVE ANALYSIS SUMMARY
+{"=" * 50}
+
+Analysis Date: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}
+
+Total Wells Analyzed: {results_df['WellID'].nunique()}
+Total Fits: {len(results_df)}
+
+Fit Quality:
+  Excellent (R² > 0.9): {n_above[3]}
+  Good (R² > 0.8): {n_above[2]}
+  Fair (R² > 0.7): {n_above[1]}
+
+Average R²: {r2_avg}
+Min R²: {r2_min}
+Max R²: {r2_max}
+
+By Product:
+{per_measure}""".encode('utf-8')
+
+
 def init_session_state():
     """Initialize all session state variables."""
     defaults = {
         'uploaded_file': None,
         'production_df': None,
         'well_list_df': None,
+        'data_stats': None,
         'csv_loader': None,
         'results_df': None,
+        'summary_stats': None,
+        'unique_wells': (),
+        'well_index': {},
         'data_valid': False,
         'analysis_complete': False,
         'selected_well': None,
         'selected_measure': None,
         'aggregate_data': {},
+        'aggregate_wells': {},
+        'well_lookup': None,
         'auto_navigate_to_viz': False
     }
     
@@ -482,23 +918,7 @@ else:
 
 # Add info section in sidebar
 with st.sidebar.expander("ℹ️ About This App"):
-    st.write("""
-    This application performs Arps decline curve analysis on oil and gas production data.
-    
-    **Features:**
-    - Upload CSV production data
-    - Automatic data validation
-    - Interactive decline curve fitting
-    - Adjustable parameters
-    - Export results
-    
-    **Required CSV Format:**
-    - WellID (integer)
-    - Measure (OIL/GAS/WATER)
-    - Date (YYYY-MM-DD)
-    - Value (production volume)
-    - ProducingDays (optional)
-    """)
+    st.write(_ABOUT_MD)
 
 with st.sidebar.expander("📥 Download Sample Data"):
     st.write("Download sample CSV files to test the app:")
@@ -542,22 +962,17 @@ if page == "📤 Upload Data":
         if uploaded_file is not None:
             st.session_state.uploaded_file = uploaded_file
             
-            # Save to temporary location
-            temp_path = Path("temp_production_data.csv")
-            with open(temp_path, 'wb') as f:
-                f.write(uploaded_file.getvalue())
-            
             try:
                 # Load and validate data
                 with st.spinner("Loading and validating data..."):
-                    csv_loader = CSVDataLoader(str(temp_path))
-                    production_df = csv_loader.load_production_data()
-                    well_list_df = csv_loader.load_well_list()
+                    # Read the upload from memory; no temp file round trip
+                    csv_loader, production_df, well_list_df, issues, data_stats = load_uploaded_csv(uploaded_file.getvalue())
                     
                     # Store in session state
                     st.session_state.csv_loader = csv_loader
                     st.session_state.production_df = production_df
                     st.session_state.well_list_df = well_list_df
+                    st.session_state.data_stats = data_stats
                     st.session_state.data_valid = True
                 
                 # Success message
@@ -574,13 +989,13 @@ if page == "📤 Upload Data":
                     st.metric("Total Records", f"{len(production_df):,}")
                 
                 with col_b:
-                    st.metric("Unique Wells", production_df['WellID'].nunique())
+                    st.metric("Unique Wells", data_stats['production_wells'])
                 
                 with col_c:
-                    st.metric("Date Range", f"{(production_df['Date'].max() - production_df['Date'].min()).days} days")
+                    st.metric("Date Range", f"{data_stats['date_range_days']} days")
                 
                 with col_d:
-                    st.metric("Products", production_df['Measure'].nunique())
+                    st.metric("Products", data_stats['production_measures'])
                 
                 # Show data preview
                 st.subheader("📋 Data Preview")
@@ -593,8 +1008,6 @@ if page == "📤 Upload Data":
                 # Data quality checks
                 st.subheader("✅ Data Quality Checks")
                 
-                issues = csv_loader.validate_data_quality()
-                
                 if issues['errors']:
                     st.error("❌ Errors found:")
                     for error in issues['errors']:
@@ -632,26 +1045,12 @@ if page == "📤 Upload Data":
                 st.write("- Non-numeric values in Value column")
     
     with col2:
-        st.info("""
-        **Required Columns:**
-        - `WellID` (integer)
-        - `Measure` (OIL/GAS/WATER)
-        - `Date` (YYYY-MM-DD)
-        - `Value` (float)
-        
-        **Optional:**
-        - `ProducingDays` (integer)
-        """)
+        st.info(_REQUIRED_COLUMNS_MD)
         
         st.markdown("---")
         
         st.write("**Example CSV format:**")
-        st.code("""
-WellID,Measure,Date,Value,ProducingDays
-12345678901,OIL,2023-01-01,150.5,30
-12345678901,GAS,2023-01-01,450.0,30
-12345678901,WATER,2023-01-01,50.0,30
-        """, language="csv")
+        st.code(_EXAMPLE_CSV, language="csv")
 
 # ============================================================================
 # PAGE 2: RUN ANALYSIS
@@ -665,88 +1064,101 @@ elif page == "📊 Run Analysis":
         st.info("👈 Go to **Upload Data** page to get started.")
     else:
         # Load configuration
-        config_path = Path(__file__).parent / 'config' / 'analytics_config.yaml'
-        params_list = get_config('decline_curve', path=str(config_path))
+        params_by_name = get_decline_config()
         
-        arps_params = next((item for item in params_list if item['name'] == 'arps_parameters'), None)
-        bourdet_params = next((item for item in params_list if item['name'] == 'bourdet_outliers'), None)
-        changepoint_params = next((item for item in params_list if item['name'] == 'detect_changepoints'), None)
-        b_estimate_params = next((item for item in params_list if item['name'] == 'estimate_b'), None)
-        smoothing_params = next((item for item in params_list if item['name'] == 'smoothing'), None)
-        method_params = next((item for item in params_list if item['name'] == 'method'), None) or {}
+        arps_params = params_by_name.get('arps_parameters')
+        bourdet_params = params_by_name.get('bourdet_outliers')
+        changepoint_params = params_by_name.get('detect_changepoints')
+        b_estimate_params = params_by_name.get('estimate_b')
+        smoothing_params = params_by_name.get('smoothing')
+        method_params = params_by_name.get('method') or {}
         
         # Sidebar controls
         st.sidebar.header("⚙️ Analysis Parameters")
         
-        # Fitting method
-        fit_method = st.sidebar.selectbox(
-            "Fitting Method",
-            ['curve_fit', 'monte_carlo', 'differential_evolution'],
-            index=0,
-            help="curve_fit is fastest, monte_carlo most robust"
-        )
-        
-        st.sidebar.markdown("---")
-        
-        # Decline parameters
-        st.sidebar.subheader("Decline Parameters")
-        
-        dei_min = st.sidebar.slider(
-            "Min Initial Decline",
-            0.0, 1.0,
-            float(arps_params['initial_decline'].get('min', 0.3)),
-            0.01,
-            help="Minimum initial decline rate"
-        )
-        
-        dei_max = st.sidebar.slider(
-            "Max Initial Decline",
-            0.0, 1.0,
-            float(arps_params['initial_decline'].get('max', 0.99)),
-            0.01,
-            help="Maximum initial decline rate"
-        )
-        
-        # Advanced options
-        with st.sidebar.expander("🔧 Advanced Options"):
-            fit_months = st.number_input(
-                "Fit Months",
-                min_value=6,
-                max_value=120,
-                value=60,
-                help="Number of months of history to use for fitting"
+        # Fit parameters live in a form so edits only rerun the page when applied. The analysis
+        # type and time normalization (Step 1) stay live widgets on purpose: they change which
+        # options and guidance the page shows, and the rerun they cost reuses the cached upload.
+        with st.sidebar.form("analysis_params"):
+            # Fitting method
+            fit_method = st.selectbox(
+                "Fitting Method",
+                ['curve_fit', 'curve_fit_jac', 'monte_carlo', 'differential_evolution'],
+                index=0,
+                format_func=lambda m: "curve_fit + analytic Jacobian (faster)" if m == 'curve_fit_jac' else m,
+                help="curve_fit is the default, curve_fit_jac is faster, monte_carlo most robust"
             )
             
-            outlier_removal = st.checkbox(
-                "Remove Outliers (Bourdet)",
-                value=bourdet_params['setting'],
-                help="Use Bourdet derivative to remove outliers"
-            )
+            st.markdown("---")
             
-            changepoint_detection = st.checkbox(
-                "Detect Changepoints",
-                value=changepoint_params['setting'],
-                help="Detect production regime changes"
+            # Decline parameters
+            st.subheader("Decline Parameters")
+            
+            dei_min = st.slider(
+                "Min Initial Decline",
+                0.0, 1.0,
+                float(arps_params['initial_decline'].get('min', 0.3)),
+                0.01,
+                help="Minimum initial decline rate"
             )
             
-            estimate_b = st.checkbox(
-                "Estimate b-factor",
-                value=b_estimate_params['setting'],
-                help="Estimate b-factor from data (vs. using default)"
+            dei_max = st.slider(
+                "Max Initial Decline",
+                0.0, 1.0,
+                float(arps_params['initial_decline'].get('max', 0.99)),
+                0.01,
+                help="Maximum initial decline rate"
             )
+            
+            # Advanced options
+            with st.expander("🔧 Advanced Options"):
+                fit_months = st.number_input(
+                    "Fit Months",
+                    min_value=6,
+                    max_value=120,
+                    value=60,
+                    help="Number of months of history to use for fitting"
+                )
+                
+                outlier_removal = st.checkbox(
+                    "Remove Outliers (Bourdet)",
+                    value=bourdet_params['setting'],
+                    help="Use Bourdet derivative to remove outliers"
+                )
+                
+                changepoint_detection = st.checkbox(
+                    "Detect Changepoints",
+                    value=changepoint_params['setting'],
+                    help="Detect production regime changes"
+                )
+                
+                estimate_b = st.checkbox(
+                    "Estimate b-factor",
+                    value=b_estimate_params['setting'],
+                    help="Estimate b-factor from data (vs. using default)"
+                )
+                
+                st.checkbox(
+                    "Show debug output",
+                    key="debug_mode",
+                    help="Write aggregate-fit diagnostics to the page"
+                )
+            
+            st.form_submit_button("Apply", use_container_width=True)
         
         # Main content area
         # Load well list from session state first
         well_list_df = st.session_state.well_list_df
         
-        # Load production data to get accurate well count
-        prod_df = st.session_state.csv_loader.load_production_data()
-        total_wells_in_data = prod_df['WellID'].nunique()
+        # Production data parsed at upload time (load_uploaded_csv); no reload per rerun
+        prod_df = st.session_state.production_df
+        data_stats = st.session_state.data_stats
+        total_wells_in_data = data_stats['production_wells']
         
         # STEP 1: Analysis Type Selection
         st.subheader("🎯 Step 1: Select Analysis Type")
         
-        # Analysis type selector - PROMINENT in main content
+        # Analysis type selector - PROMINENT in main content; live, outside the sidebar form
         analysis_type = st.radio(
             "Choose your analysis approach:",
             ["Individual Wells", "Aggregate/Type Curve"],
@@ -762,13 +1174,11 @@ elif page == "📊 Run Analysis":
                     f"Total analyses to run: {len(well_list_df)}")
             time_normalize = False  # Not applicable for individual wells
         else:
-            measures = well_list_df['Measure'].unique()
+            measures = data_stats['measures']
             st.success("📈 **Aggregate/Type Curve Analysis**: Production will be averaged across all wells by month. "
                        f"You'll get one representative curve per measure ({', '.join(measures)}). "
                        f"Analyzing {total_wells_in_data} wells combined.")
             
-            st.write("DEBUG: About to show checkbox")  # DEBUG LINE
-            
             # Time normalization option for aggregate analysis
             time_normalize = st.checkbox(
                 "⏱️ Time-Normalize Wells (Recommended for Staggered Start Dates)",
@@ -794,23 +1204,25 @@ elif page == "📊 Run Analysis":
         with col1:
             st.write("**Well List:**")
             
-            # Show well list
+            # Show well list; only a preview goes to the browser
+            preview_rows = 500
             st.dataframe(
-                well_list_df[['WellID', 'Measure', 'LastProdDate']],
+                well_list_df[['WellID', 'Measure', 'LastProdDate']].head(preview_rows),
                 use_container_width=True,
                 height=300
             )
+            if len(well_list_df) > preview_rows:
+                st.caption(f"Showing {preview_rows} of {len(well_list_df)} rows.")
             
             st.write(f"**Total:** {len(well_list_df)} well/measure combinations")
         
         with col2:
             st.subheader("🎯 Quick Stats")
             
-            st.metric("Wells", well_list_df['WellID'].nunique())
-            st.metric("Products", well_list_df['Measure'].nunique())
+            st.metric("Wells", data_stats['well_list_wells'])
+            st.metric("Products", len(data_stats['measure_counts']))
             
-            measure_counts = well_list_df['Measure'].value_counts()
-            for measure, count in measure_counts.items():
+            for measure, count in data_stats['measure_counts'].items():
                 st.write(f"**{measure}:** {count}")
         
         st.markdown("---")
@@ -825,6 +1237,7 @@ elif page == "📊 Run Analysis":
                 if st.button("🔄 Re-run Analysis", type="primary", use_container_width=True, key="rerun_btn"):
                     st.session_state.analysis_complete = False
                     st.session_state.results_df = None
+                    fit_aggregate_cached.clear()
                     st.rerun()
             with col_btn2:
                 st.info("Click to clear cached results and re-run with updated code")
@@ -832,66 +1245,80 @@ elif page == "📊 Run Analysis":
         # Run analysis button
         if st.button("🚀 Run Analysis", type="primary", use_container_width=True, disabled=st.session_state.analysis_complete):
             
-            # Import required modules
-            import importlib.util
-            spec = importlib.util.spec_from_file_location(
-                "arps_autofit_csv",
-                Path(__file__).parent / "play_assesments_tools" / "python files" / "arps_autofit_csv.py"
-            )
-            arps_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(arps_module)
+            # Imported once; re-imported only if the script changes on disk
+            arps_module = load_arps_module(ARPS_MODULE_PATH.stat().st_mtime)
             
-            process_well_csv = arps_module.process_well_csv
             fit_aggregate_arps_curve = arps_module.fit_aggregate_arps_curve
-            param_df_cols = arps_module.param_df_cols
             
             # Progress tracking
             progress_bar = st.progress(0)
             status_text = st.empty()
             
-            results = []
+            # Preallocated record buffer; one row per well/measure at most
+            results = np.empty(len(well_list_df), dtype=arps_module.param_record_dtype)
+            n_filled = 0
             
             # AGGREGATE ANALYSIS
             if analysis_type == "Aggregate/Type Curve":
                 status_text.text("Running aggregate/type curve analysis...")
                 progress_bar.progress(0.3)
                 
-                # Load ALL production data
-                prod_df = st.session_state.csv_loader.load_production_data()
+                # ALL production data (prod_df from the page setup above)
                 
                 # Run aggregate analysis for each measure
-                measures = well_list_df['Measure'].unique()
-                st.write(f"DEBUG: Found measures: {measures}")
-                st.write(f"DEBUG: time_normalize = {time_normalize}")
+                measures = data_stats['measures']
+                
+                # One debug expander for all measures, only when asked for
+                debug_mode = st.session_state.get('debug_mode', False)
+                debug_container = st.expander("🔍 Debug info", expanded=True) if debug_mode else None
+                if debug_mode:
+                    debug_container.write(f"DEBUG: Found measures: {measures}")
+                    debug_container.write(f"DEBUG: time_normalize = {time_normalize}")
+                
+                # Row positions per measure from one groupby pass; each measure is then a positional take
+                measure_rows = prod_df.groupby('Measure', observed=True, sort=False).indices
                 
                 for measure in measures:
                     status_text.text(f"Fitting aggregate curve for {measure}...")
+                    measure_df = prod_df.take(measure_rows.get(measure, []))
                     
                     try:
-                        st.write(f"DEBUG: Calling fit_aggregate_arps_curve for {measure}")
-                        debug_container = st.expander(f"🔍 Debug info for {measure}", expanded=True)
-                        result, agg_df = fit_aggregate_arps_curve(
-                            prod_df_all_wells=prod_df,
-                            measure=measure,
-                            value_col='Value',
-                            dei_dict=arps_module.dei_dict1,
-                            def_dict=arps_module.def_dict,
-                            b_dict=arps_module.default_b_dict[measure],
-                            method=fit_method,
-                            trials=arps_module.trials,
-                            smoothing_factor=arps_module.smoothing_params['factor'],
-                            time_normalize=time_normalize,
-                            debug_output=debug_container
-                        )
+                        if debug_mode:
+                            debug_container.write(f"DEBUG: Calling fit_aggregate_arps_curve for {measure}")
+                            # Bypass the cache so the fit's diagnostics are written to the expander
+                            result, agg_df = fit_aggregate_arps_curve(
+                                prod_df_all_wells=measure_df,
+                                measure=measure,
+                                value_col='Value',
+                                dei_dict=arps_module.dei_dict1,
+                                def_dict=arps_module.def_dict,
+                                b_dict=arps_module.default_b_dict[measure],
+                                method=fit_method,
+                                trials=arps_module.trials,
+                                smoothing_factor=arps_module.smoothing_params['factor'],
+                                time_normalize=time_normalize,
+                                debug_output=debug_container
+                            )
+                        else:
+                            result, agg_df = fit_aggregate_cached(
+                                arps_module, measure_df,
+                                (data_stats['fingerprint'], ARPS_MODULE_PATH.stat().st_mtime,
+                                 Path(fcst.__file__).stat().st_mtime),
+                                measure, fit_method, time_normalize
+                            )
                         
-                        st.write(f"DEBUG: Result is None: {result is None}")
+                        if debug_mode:
+                            debug_container.write(f"DEBUG: Result is None: {result is None}")
                         if result is not None:
-                            st.write(f"DEBUG: Appending result for {measure}")
-                            results.append(result)
+                            results[n_filled] = tuple(result)
+                            n_filled += 1
                             # Store aggregated data for visualization
                             if 'aggregate_data' not in st.session_state:
                                 st.session_state.aggregate_data = {}
                             st.session_state.aggregate_data[measure] = agg_df
+                            # Keep this measure's per-well rows so Visualize doesn't reload the CSV;
+                            # only the columns the scatter and data table use (Measure is implied by the key)
+                            st.session_state.aggregate_wells[measure] = measure_df[['WellID', 'Date', 'Value']]
                             # Store time_normalize flag for visualization
                             st.session_state.time_normalize = time_normalize
                         else:
@@ -907,32 +1334,45 @@ elif page == "📊 Run Analysis":
             # INDIVIDUAL WELL ANALYSIS
             else:
                 total_wells = len(well_list_df)
-                for idx, row in well_list_df.iterrows():
-                    try:
-                        # Update progress
-                        progress = (idx + 1) / total_wells
-                        progress_bar.progress(progress)
-                        status_text.text(f"Processing {idx + 1}/{total_wells}: Well {row['WellID']} - {row['Measure']}")
-                        
-                        # Process well
-                        result = process_well_csv(
-                            wellid=row['WellID'],
-                            measure=row['Measure'],
-                            last_prod_date=row['LastProdDate'],
-                            csv_loader=st.session_state.csv_loader,
-                            fit_method=fit_method
-                        )
-                        results.append(result)
-                        
-                    except Exception as e:
-                        st.warning(f"⚠️ Well {row['WellID']} - {row['Measure']}: {str(e)}")
-                        continue
+                status_text.text(f"Fitting {total_wells} well/measure combinations in parallel...")
+                # Batches finish in order; refresh progress per batch and report failures once at the end
+                failed = []
+                for wells_done, batch_results in arps_module.iter_well_batches(
+                    well_list_df, st.session_state.csv_loader, fit_method=fit_method
+                ):
+                    for wellid, measure, result, error in batch_results:
+                        if error is not None:
+                            failed.append((wellid, measure, error))
+                            continue
+                        results[n_filled] = tuple(result)
+                        n_filled += 1
+                    progress_bar.progress(wells_done / total_wells)
+                    status_text.text(f"Processed {wells_done}/{total_wells} well/measure combinations")
+                
+                if failed:
+                    st.warning(f"⚠️ {len(failed)} well/measure combinations failed to fit")
+                    st.dataframe(pd.DataFrame(failed, columns=['WellID', 'Measure', 'Error']), use_container_width=True)
             
             # Create results DataFrame
-            results_df = pd.DataFrame(results, columns=param_df_cols)
+            results_df = arps_module.results_to_df(results[:n_filled])
             
             # Store in session state
             st.session_state.results_df = results_df
+            # Headline metrics, computed once for both summary blocks
+            st.session_state.summary_stats = {
+                'n': len(results_df),
+                'good': int((results_df['R_squared'] > 0.8).sum()),
+                'avg': float(results_df['R_squared'].mean()),
+            }
+            # Well order for the Visualize selectbox/navigation, with O(1) position lookup
+            st.session_state.unique_wells = tuple(results_df['WellID'].unique().tolist())
+            st.session_state.well_index = {w: i for i, w in enumerate(st.session_state.unique_wells)}
+            # One row per (WellID, Measure) so .loc on a key always yields a single row
+            st.session_state.well_lookup = (
+                well_list_df.drop_duplicates(['WellID', 'Measure'])
+                .set_index(['WellID', 'Measure'])
+                .sort_index()
+            )
             st.session_state.analysis_complete = True
             
             # Auto-select first well/measure for visualization
@@ -947,34 +1387,37 @@ elif page == "📊 Run Analysis":
             # Success message with auto-navigation prompt
             st.success(f"✅ Analysis complete! Processed {len(results_df)} wells.")
             
-            # Add anchor and auto-scroll to results
+            # Add anchor and auto-scroll to results. st.markdown strips <script>, so the
+            # one-shot scroll runs in a zero-height component frame; this block only
+            # renders on the run that just finished, never on later reruns.
             st.markdown('<div id="results-section"></div>', unsafe_allow_html=True)
-            st.markdown("""
+            components.html(
+                """
                 <script>
-                    setTimeout(function() {
-                        const element = document.getElementById('results-section');
-                        if (element) {
-                            element.scrollIntoView({ behavior: 'smooth', block: 'start' });
-                        }
-                    }, 100);
+                    const element = window.parent.document.getElementById('results-section');
+                    if (element) {
+                        element.scrollIntoView({ behavior: 'smooth', block: 'start' });
+                    }
                 </script>
-            """, unsafe_allow_html=True)
+                """,
+                height=0
+            )
             
             # Show summary
             st.subheader("📊 Results Summary")
             
             col_a, col_b, col_c, col_d = st.columns(4)
             
+            summary_stats = st.session_state.summary_stats
+            
             with col_a:
-                st.metric("Total Fits", len(results_df))
+                st.metric("Total Fits", summary_stats['n'])
             
             with col_b:
-                good_fits = (results_df['R_squared'] > 0.8).sum()
-                st.metric("Good Fits (R²>0.8)", good_fits)
+                st.metric("Good Fits (R²>0.8)", summary_stats['good'])
             
             with col_c:
-                avg_r2 = results_df['R_squared'].mean()
-                st.metric("Avg R²", f"{avg_r2:.3f}")
+                st.metric("Avg R²", f"{summary_stats['avg']:.3f}")
             
             with col_d:
                 st.metric("Fit Method", fit_method)
@@ -982,16 +1425,16 @@ elif page == "📊 Run Analysis":
             # Show results table
             st.subheader("📋 Fitted Parameters")
             display_cols = ['WellID', 'Measure', 'Q3', 'Dei', 'b_factor', 'R_squared']
-            display_df = results_df[display_cols].copy()
-            display_df['Dei'] = display_df['Dei'].apply(lambda x: f"{x:.3f}")
-            display_df['b_factor'] = display_df['b_factor'].apply(lambda x: f"{x:.3f}")
-            display_df['R_squared'] = display_df['R_squared'].apply(lambda x: f"{x:.3f}")
-            display_df['Q3'] = display_df['Q3'].apply(lambda x: f"{x:.1f}")
+            display_formats = {'Dei': '{:.3f}', 'b_factor': '{:.3f}', 'R_squared': '{:.3f}', 'Q3': '{:.1f}'}
+            # Only a preview goes to the browser; the Export page downloads the full table
+            preview_rows = 500
             st.dataframe(
-                display_df,
+                results_df[display_cols].head(preview_rows).style.format(display_formats),
                 use_container_width=True,
                 height=400
             )
+            if len(results_df) > preview_rows:
+                st.caption(f"Showing {preview_rows} of {len(results_df)} rows — download the full table from **Export Data**.")
             
             # Next step - Quick access to visualization
             st.markdown("---")
@@ -1008,20 +1451,18 @@ elif page == "📊 Run Analysis":
         elif st.session_state.analysis_complete:
             st.info("✅ Analysis already complete. Results available in **Visualize Results** page.")
             
-            results_df = st.session_state.results_df
-            
             col_a, col_b, col_c = st.columns(3)
             
+            summary_stats = st.session_state.summary_stats
+            
             with col_a:
-                st.metric("Total Fits", len(results_df))
+                st.metric("Total Fits", summary_stats['n'])
             
             with col_b:
-                good_fits = (results_df['R_squared'] > 0.8).sum()
-                st.metric("Good Fits (R²>0.8)", good_fits)
+                st.metric("Good Fits (R²>0.8)", summary_stats['good'])
             
             with col_c:
-                avg_r2 = results_df['R_squared'].mean()
-                st.metric("Avg R²", f"{avg_r2:.3f}")
+                st.metric("Avg R²", f"{summary_stats['avg']:.3f}")
 
 # ============================================================================
 # PAGE 3: VISUALIZE RESULTS
@@ -1064,8 +1505,8 @@ elif page == "📈 Visualize Results":
         else:
             st.sidebar.header("🎯 Select Well")
             # Well selection
-            unique_wells = results_df['WellID'].unique()
-            default_well_idx = get_default_index(st.session_state.selected_well, unique_wells)
+            unique_wells = st.session_state.unique_wells
+            default_well_idx = st.session_state.well_index.get(st.session_state.selected_well, 0)
             
             selected_well = st.sidebar.selectbox(
                 "Well ID",
@@ -1088,55 +1529,40 @@ elif page == "📈 Visualize Results":
                 key="viz_measure_select_ind"
             )
         
-        st.sidebar.markdown("---")
-        
-        # Chart options
-        st.sidebar.subheader("📊 Chart Options")
-        
-        show_forecast = st.sidebar.checkbox("Show Forecast", value=True)
-        forecast_months = st.sidebar.slider("Forecast Months", 6, 60, 24)
-        
-        chart_scale = st.sidebar.radio(
-            "Scale",
-            ["Linear", "Log", "Both"],
-            index=2
+        # Get result for selected well/measure as plain floats (no per-field Series lookups)
+        source_df = results_df if is_aggregate else well_results
+        matches = np.flatnonzero(source_df['Measure'].to_numpy() == selected_measure)
+        if matches.size == 0:
+            st.warning(f"⚠️ No fitted result for {selected_measure} on the selected well. Please re-run analysis.")
+            st.stop()
+        q3, dei, b_factor, r_squared = (
+            source_df[['Q3', 'Dei', 'b_factor', 'R_squared']].to_numpy(dtype=np.float64)[matches[0]]
         )
         
-        # Get result for selected well/measure
-        if is_aggregate:
-            result_row = results_df[results_df['Measure'] == selected_measure].iloc[0]
-        else:
-            result_row = well_results[well_results['Measure'] == selected_measure].iloc[0]
-        
         # Get actual production data
         if is_aggregate:
             # For aggregate: use the aggregated data stored during analysis
-            if 'aggregate_data' in st.session_state and selected_measure in st.session_state.aggregate_data:
+            if selected_measure in st.session_state.aggregate_data and \
+                    selected_measure in st.session_state.aggregate_wells:
                 agg_df = st.session_state.aggregate_data[selected_measure]
-                # Also load ALL individual well data for plotting
-                prod_df = csv_loader.load_production_data()
-                all_wells_data = prod_df[prod_df['Measure'] == selected_measure].copy()
+                # Individual well data for plotting, stored at analysis time
+                all_wells_data = st.session_state.aggregate_wells[selected_measure]
             else:
                 st.error("Aggregate data not found. Please re-run analysis.")
                 st.stop()
         else:
             # For individual: get single well data
-            # Ensure WellID types match - convert both to same type
-            well_list_df_copy = well_list_df.copy()
-            well_list_df_copy['WellID'] = well_list_df_copy['WellID'].astype(type(selected_well))
-            
-            well_list_row = well_list_df_copy[
-                (well_list_df_copy['WellID'] == selected_well) & 
-                (well_list_df_copy['Measure'] == selected_measure)
-            ].iloc[0]
-            
-            # Convert selected_well to int for csv_loader
+            # Convert selected_well to int for csv_loader and the (WellID, Measure) lookup
             wellid_int = int(selected_well) if not isinstance(selected_well, int) else selected_well
             
-            actual_data = csv_loader.get_well_production(
-                wellid=wellid_int,
-                measure=selected_measure,
-                last_prod_date=well_list_row['LastProdDate'],
+            well_list_row = st.session_state.well_lookup.loc[(wellid_int, selected_measure)]
+            
+            actual_data = get_well_history(
+                csv_loader,
+                st.session_state.data_stats['fingerprint'],
+                wellid_int,
+                selected_measure,
+                well_list_row['LastProdDate'],
                 fit_months=120
             )
         
@@ -1147,17 +1573,14 @@ elif page == "📈 Visualize Results":
             if is_aggregate:
                 st.info(f"📈 Viewing aggregate type curve for **{selected_measure}**")
             else:
-                total_wells = len(results_df['WellID'].unique())
+                total_wells = len(st.session_state.unique_wells)
                 st.info(f"📈 Viewing well **{selected_well}** - **{selected_measure}** ({total_wells} wells analyzed)")
         
         with col_nav:
             # Quick navigation buttons
-            if not is_aggregate and len(results_df['WellID'].unique()) > 1:
-                unique_wells_list = list(results_df['WellID'].unique())
-                try:
-                    current_idx = unique_wells_list.index(selected_well)
-                except ValueError:
-                    current_idx = 0
+            unique_wells_list = st.session_state.unique_wells
+            if not is_aggregate and len(unique_wells_list) > 1:
+                current_idx = st.session_state.well_index.get(selected_well, 0)
                 
                 col_prev, col_next = st.columns(2)
                 with col_prev:
@@ -1182,257 +1605,204 @@ elif page == "📈 Visualize Results":
         col1, col2, col3, col4, col5 = st.columns(5)
         
         with col1:
-            st.metric("Qi (Initial Rate)", f"{result_row['Q3']:.1f}")
+            st.metric("Qi (Initial Rate)", f"{q3:.1f}")
         
         with col2:
-            st.metric("Dei (Initial Decline)", f"{result_row['Dei']:.1%}")
+            st.metric("Dei (Initial Decline)", f"{dei:.1%}")
         
         with col3:
-            st.metric("b-factor", f"{result_row['b_factor']:.3f}")
+            st.metric("b-factor", f"{b_factor:.3f}")
         
         with col4:
-            st.metric("R²", f"{result_row['R_squared']:.3f}")
+            st.metric("R²", f"{r_squared:.3f}")
         
         with col5:
-            quality = "Excellent" if result_row['R_squared'] > 0.9 else "Good" if result_row['R_squared'] > 0.8 else "Fair"
+            quality = "Excellent" if r_squared > 0.9 else "Good" if r_squared > 0.8 else "Fair"
             st.metric("Fit Quality", quality)
         
         st.markdown("---")
         
-        # Generate forecast
-        if is_aggregate:
-            # For aggregate: use aggregated data length
-            t_months = np.arange(0, len(agg_df) + forecast_months)
-            start_date = agg_df['months_from_start'].min()
-            history_end = len(agg_df)
-        else:
-            # For individual: use actual data length
-            t_months = np.arange(0, len(actual_data) + forecast_months)
-            start_date = actual_data['Date'].min()
-            history_end = len(actual_data)
-        
-        def_val = 0.06 if selected_measure == 'GAS' else 0.08
-        
-        forecast = fcst.varps_decline(
-            1, 1,
-            result_row['Q3'],
-            result_row['Dei'],
-            def_val,
-            result_row['b_factor'],
-            t_months, 0, 0
-        )
-        
-        # Create x-axis values for forecast - handle time-normalized vs calendar time
+        # Prepare the aggregate well scatter once per run; it doesn't depend on the chart options
         if is_aggregate:
             # Check if time normalization was used
             use_time_normalize = st.session_state.get('time_normalize', False)
+            all_wells_data_historical = all_wells_data.sort_values(['WellID', 'Date'], ignore_index=True)
             
             if use_time_normalize:
                 # TIME-NORMALIZED: Use months from start (0, 1, 2, ..., N)
                 # History ends at the maximum normalized month in aggregated data
                 max_month_normalized = agg_df['months_from_start'].max()
                 
-                # Prepare individual well data with normalized months
-                all_wells_data_historical = all_wells_data.copy()
-                # Calculate normalized months for each well (keep fractional for day-level variation)
-                normalized_wells = []
-                for well_id in all_wells_data_historical['WellID'].unique():
-                    well_df = all_wells_data_historical[all_wells_data_historical['WellID'] == well_id].copy()
-                    well_df = well_df.sort_values('Date')
-                    well_min_date = well_df['Date'].min()
-                    # Keep fractional months to preserve day-of-month variation
-                    well_df['months_from_start'] = (well_df['Date'] - well_min_date).dt.days / 30.42
-                    # Only keep data up to the max normalized month
-                    well_df = well_df[well_df['months_from_start'] <= max_month_normalized]
-                    normalized_wells.append(well_df)
-                all_wells_data_historical = pd.concat(normalized_wells, ignore_index=True)
+                # Months since each well's first date (keep fractional for day-level variation)
+                well_min_date = all_wells_data_historical.groupby('WellID')['Date'].transform('min')
+                all_wells_data_historical['months_from_start'] = (all_wells_data_historical['Date'] - well_min_date).dt.days / 30.42
+                # Only keep data up to the max normalized month
+                all_wells_data_historical = all_wells_data_historical[
+                    all_wells_data_historical['months_from_start'] <= max_month_normalized
+                ].reset_index(drop=True)
                 
                 # X-axis is normalized months
-                forecast_x_values = t_months
                 x_axis_label = "Months from First Production"
-                
             else:
-                # CALENDAR TIME: Use actual dates
-                max_date_actual = all_wells_data['Date'].max()
+                # CALENDAR TIME: Use actual dates; all actual data is historical
                 min_date_actual = all_wells_data['Date'].min()
-                
-                # All actual data is historical
-                all_wells_data_historical = all_wells_data.copy()
-                
-                # Create forecast dates
-                forecast_dates = pd.date_range(start=min_date_actual, periods=len(t_months), freq='MS').tolist()
-                
-                # Find where history ends in calendar time
-                history_end_date_index = None
-                for i, date in enumerate(forecast_dates):
-                    if date <= max_date_actual:
-                        history_end_date_index = i
-                
-                if history_end_date_index is not None:
-                    history_end = history_end_date_index + 1
-                
-                forecast_x_values = forecast_dates
+                max_date_actual = all_wells_data['Date'].max()
                 x_axis_label = "Date"
-        else:
-            # Individual well: always use calendar dates
-            forecast_dates = pd.date_range(start=start_date, periods=len(t_months), freq='MS').tolist()
-            actual_dates = actual_data['Date'].tolist()
-            forecast_x_values = forecast_dates
-            x_axis_label = "Date"
-        
-        # Create interactive Plotly chart
-        if chart_scale in ["Linear", "Both"]:
-            st.subheader("📈 Linear Scale")
             
-            fig_linear = go.Figure()
+            # Thin very long (e.g. daily) well histories once, for both charts
+            well_sizes = all_wells_data_historical['WellID'].value_counts()
+            long_wells = well_sizes.index[well_sizes > 500]
+            if len(long_wells) > 0:
+                is_long = all_wells_data_historical['WellID'].isin(long_wells)
+                all_wells_data_historical = pd.concat(
+                    [all_wells_data_historical[~is_long]]
+                    + [downsample_log(g) for _, g in all_wells_data_historical[is_long].groupby('WellID')],
+                    ignore_index=True
+                )
             
-            # Actual production
+            # Cap the total marker count; a fixed stride over the WellID/Date-sorted rows keeps each well's share
+            max_scatter_points = 20000
+            n_points = len(all_wells_data_historical)
+            if n_points > max_scatter_points:
+                step = -(-n_points // max_scatter_points)
+                all_wells_data_historical = all_wells_data_historical.iloc[::step]
+                st.caption(f"Well scatter shows every {step}th of {n_points:,} points to keep the charts responsive.")
+            scatter_x_col = 'months_from_start' if use_time_normalize else 'Date'
+        
+        def_val = DEF_VAL_BY_MEASURE.get(selected_measure, 0.08)
+        
+        @st.fragment
+        def render_decline_charts():
+            """Chart options plus both charts; changing an option reruns only this block, not the page."""
+            # Chart options (fragments can't write to the sidebar, so they sit above the charts)
+            col_fcst, col_months, col_scale = st.columns(3)
+            with col_fcst:
+                show_forecast = st.checkbox("Show Forecast", value=True, key="viz_show_forecast")
+            with col_months:
+                forecast_months = st.slider("Forecast Months", 6, 60, 24, key="viz_forecast_months")
+            with col_scale:
+                chart_scale = st.radio("Scale", ["Linear", "Log", "Both"], index=2, horizontal=True, key="viz_chart_scale")
+            
+            # Generate forecast
             if is_aggregate:
-                # Plot individual wells' data points (ONLY historical data, not forecast period)
-                use_time_normalize = st.session_state.get('time_normalize', False)
-                for well_id in all_wells_data_historical['WellID'].unique():
-                    well_data = all_wells_data_historical[all_wells_data_historical['WellID'] == well_id]
-                    if use_time_normalize:
-                        x_data = well_data['months_from_start']
-                        hover_template = f'Well {well_id}<br>Month: %{{x}}<br>Rate: %{{y:.1f}}<extra></extra>'
-                    else:
-                        x_data = well_data['Date']
-                        hover_template = f'Well {well_id}<br>Date: %{{x}}<br>Rate: %{{y:.1f}}<extra></extra>'
-                    
-                    fig_linear.add_trace(go.Scatter(
-                        x=x_data,
-                        y=well_data['Value'],
-                        mode='markers',
-                        name=f'Well {well_id}',
-                        marker=dict(size=6, opacity=0.3),
-                        showlegend=False,
-                        hovertemplate=hover_template
-                    ))
+                # For aggregate: use aggregated data length
+                t_months = np.arange(0, len(agg_df) + forecast_months)
+                history_end = len(agg_df)
+            else:
+                # For individual: use actual data length
+                t_months = np.arange(0, len(actual_data) + forecast_months)
+                history_end = len(actual_data)
+            
+            # Scalar-keyed cache: Show Forecast / chart-scale toggles don't re-evaluate the curve
+            forecast_q = forecast_rate(
+                float(q3),
+                float(dei),
+                float(def_val),
+                float(b_factor),
+                len(t_months)
+            )
+            
+            # Create x-axis values for forecast - handle time-normalized vs calendar time
+            if is_aggregate and use_time_normalize:
+                forecast_x_values = t_months
+            elif is_aggregate:
+                forecast_dates = pd.date_range(start=min_date_actual, periods=len(t_months), freq='MS')
                 
-                # NOTE: Averaged data points removed - the fitted ARPS curve represents the average
-                # The curve is fitted to the monthly averages, so showing both is redundant
+                # Find where history ends in calendar time (dates are sorted)
+                history_end_date_count = int(forecast_dates.searchsorted(max_date_actual, side='right'))
+                if history_end_date_count > 0:
+                    history_end = history_end_date_count
+                
+                # datetime64[ns] array straight into Plotly, no per-element Timestamp boxing
+                forecast_x_values = forecast_dates.to_numpy()
             else:
-                # Individual well: plot single well data
-                fig_linear.add_trace(go.Scatter(
-                    x=actual_data['Date'],
-                    y=actual_data['Value'],
-                    mode='markers',
-                    name='Actual Production',
-                    marker=dict(size=8, color='#2E86AB', opacity=0.7),
-                    hovertemplate='Date: %{x}<br>Rate: %{y:.1f}<extra></extra>'
-                ))
+                # Individual well: always use calendar dates
+                forecast_x_values = pd.date_range(
+                    start=actual_data['Date'].min(), periods=len(t_months), freq='MS'
+                ).to_numpy()
+            
             
-            # Fitted curve
-            hover_label = 'Month' if (is_aggregate and st.session_state.get('time_normalize', False)) else 'Date'
-            fig_linear.add_trace(go.Scatter(
+            # Fitted-curve and forecast traces
+            hover_label = 'Month' if (is_aggregate and use_time_normalize) else 'Date'
+            fit_trace = go.Scatter(
                 x=forecast_x_values[:history_end],
-                y=forecast[3][:history_end],
+                y=forecast_q[:history_end],
                 mode='lines',
                 name='Arps Fit (History)',
                 line=dict(width=3, color='#A23B72'),
                 hovertemplate=f'{hover_label}: %{{x}}<br>Rate: %{{y:.1f}}<extra></extra>'
-            ))
-            
-            # Forecast
-            if show_forecast:
-                fig_linear.add_trace(go.Scatter(
-                    x=forecast_x_values[history_end:],
-                    y=forecast[3][history_end:],
-                    mode='lines',
-                    name='Arps Forecast (Future)',
-                    line=dict(width=3, color='#F18F01', dash='dash'),
-                    hovertemplate=f'{hover_label}: %{{x}}<br>Rate: %{{y:.1f}}<extra></extra>'
-                ))
-            
-            chart_title = f"Aggregate Type Curve - {selected_measure}" if is_aggregate else f"Well {selected_well} - {selected_measure} Decline Curve"
-            fig_linear.update_layout(
-                title=chart_title,
-                xaxis_title=x_axis_label if is_aggregate else "Date",
-                yaxis_title=f"{selected_measure} Rate (BBL/day or MCF/day)",
-                hovermode='x unified',
-                height=500,
-                showlegend=True,
-                legend=dict(yanchor="top", y=0.99, xanchor="right", x=0.99)
             )
+            forecast_trace = go.Scatter(
+                x=forecast_x_values[history_end:],
+                y=forecast_q[history_end:],
+                mode='lines',
+                name='Arps Forecast (Future)',
+                line=dict(width=3, color='#F18F01', dash='dash'),
+                hovertemplate=f'{hover_label}: %{{x}}<br>Rate: %{{y:.1f}}<extra></extra>'
+            ) if show_forecast else None
             
-            st.plotly_chart(fig_linear, use_container_width=True)
-        
-        if chart_scale in ["Log", "Both"]:
-            st.subheader("📈 Log Scale")
-            
-            fig_log = go.Figure()
+            # Create interactive Plotly chart once; the log chart reuses it with a log y-axis
+            fig = go.Figure()
             
             # Actual production
             if is_aggregate:
                 # Plot individual wells' data points (ONLY historical data, not forecast period)
-                use_time_normalize = st.session_state.get('time_normalize', False)
-                for well_id in all_wells_data_historical['WellID'].unique():
-                    well_data = all_wells_data_historical[all_wells_data_historical['WellID'] == well_id]
-                    if use_time_normalize:
-                        x_data = well_data['months_from_start']
-                        hover_template = f'Well {well_id}<br>Month: %{{x}}<br>Rate: %{{y:.1f}}<extra></extra>'
-                    else:
-                        x_data = well_data['Date']
-                        hover_template = f'Well {well_id}<br>Date: %{{x}}<br>Rate: %{{y:.1f}}<extra></extra>'
-                    
-                    fig_log.add_trace(go.Scatter(
-                        x=x_data,
-                        y=well_data['Value'],
-                        mode='markers',
-                        name=f'Well {well_id}',
-                        marker=dict(size=6, opacity=0.4),
-                        showlegend=False,
-                        hovertemplate=hover_template
-                    ))
+                fig.add_trace(wells_scatter_trace(all_wells_data_historical, scatter_x_col, opacity=0.3))
+                
+                # NOTE: Averaged data points removed - the fitted ARPS curve represents the average
+                # The curve is fitted to the monthly averages, so showing both is redundant
             else:
-                # Individual well: plot single well data
-                fig_log.add_trace(go.Scatter(
-                    x=actual_data['Date'],
-                    y=actual_data['Value'],
+                # Individual well: plot single well data (WebGL markers, like the aggregate scatter)
+                fig.add_trace(go.Scattergl(
+                    x=actual_data['Date'].to_numpy(),
+                    y=actual_data['Value'].to_numpy(dtype=np.float32),
                     mode='markers',
                     name='Actual Production',
                     marker=dict(size=8, color='#2E86AB', opacity=0.7),
                     hovertemplate='Date: %{x}<br>Rate: %{y:.1f}<extra></extra>'
                 ))
             
-            # Fitted curve
-            hover_label = 'Month' if (is_aggregate and st.session_state.get('time_normalize', False)) else 'Date'
-            fig_log.add_trace(go.Scatter(
-                x=forecast_x_values[:history_end],
-                y=forecast[3][:history_end],
-                mode='lines',
-                name='Arps Fit (History)',
-                line=dict(width=3, color='#A23B72'),
-                hovertemplate=f'{hover_label}: %{{x}}<br>Rate: %{{y:.1f}}<extra></extra>'
-            ))
-            
-            # Forecast
-            if show_forecast:
-                fig_log.add_trace(go.Scatter(
-                    x=forecast_x_values[history_end:],
-                    y=forecast[3][history_end:],
-                    mode='lines',
-                    name='Arps Forecast (Future)',
-                    line=dict(width=3, color='#F18F01', dash='dash'),
-                    hovertemplate=f'{hover_label}: %{{x}}<br>Rate: %{{y:.1f}}<extra></extra>'
-                ))
+            # Fitted curve and forecast
+            fig.add_trace(fit_trace)
+            if forecast_trace is not None:
+                fig.add_trace(forecast_trace)
             
-            chart_title_log = f"Aggregate Type Curve - {selected_measure} (Log Scale)" if is_aggregate else f"Well {selected_well} - {selected_measure} Decline Curve (Log Scale)"
-            fig_log.update_layout(
-                title=chart_title_log,
+            chart_title = f"Aggregate Type Curve - {selected_measure}" if is_aggregate else f"Well {selected_well} - {selected_measure} Decline Curve"
+            fig.update_layout(
+                title=chart_title,
                 xaxis_title=x_axis_label if is_aggregate else "Date",
-                yaxis_title=f"{selected_measure} Rate (log scale)",
-                yaxis_type="log",
+                yaxis_title=f"{selected_measure} Rate (BBL/day or MCF/day)",
                 hovermode='x unified',
                 height=500,
                 showlegend=True,
                 legend=dict(yanchor="top", y=0.99, xanchor="right", x=0.99)
             )
             
-            st.plotly_chart(fig_log, use_container_width=True)
+            if chart_scale in ["Linear", "Both"]:
+                st.subheader("📈 Linear Scale")
+                st.plotly_chart(fig, use_container_width=True)
+            
+            if chart_scale in ["Log", "Both"]:
+                st.subheader("📈 Log Scale")
+                
+                # Copy the built figure (no trace rebuild) only when the linear chart is also shown
+                fig_log = go.Figure(fig) if chart_scale == "Both" else fig
+                if is_aggregate:
+                    # Sparser points on the log chart, so the well scatter is slightly more opaque
+                    fig_log.data[0].marker.opacity = 0.4
+                fig_log.update_layout(
+                    title=f"{chart_title} (Log Scale)",
+                    yaxis_title=f"{selected_measure} Rate (log scale)",
+                    yaxis_type="log"
+                )
+                
+                st.plotly_chart(fig_log, use_container_width=True)
+        
+        render_decline_charts()
         
         # Show data table
-        with st.expander("📋 View Production Data"):
+        # Tables are only built and sent to the browser once asked for (a collapsed expander still ships them)
+        if st.checkbox("📋 View Production Data", key="viz_show_production"):
             if is_aggregate:
                 st.write("**Aggregated Data (Monthly Averages):**")
                 st.dataframe(agg_df, use_container_width=True, height=300)
@@ -1442,18 +1812,12 @@ elif page == "📈 Visualize Results":
                 st.dataframe(actual_data, use_container_width=True, height=300)
         
         # Show all results
-        if is_aggregate:
-            with st.expander("📊 All Measures (Aggregate)"):
-                st.dataframe(
-                    results_df[['Measure', 'Q3', 'Dei', 'b_factor', 'R_squared', 'RMSE']].round(3),
-                    use_container_width=True
-                )
-        else:
-            with st.expander("📊 All Products for This Well"):
-                st.dataframe(
-                    well_results[['Measure', 'Q3', 'Dei', 'b_factor', 'R_squared', 'RMSE']].round(3),
-                    use_container_width=True
-                )
+        all_results_label = "📊 All Measures (Aggregate)" if is_aggregate else "📊 All Products for This Well"
+        if st.checkbox(all_results_label, key="viz_show_all_results"):
+            st.dataframe(
+                (results_df if is_aggregate else well_results)[['Measure', 'Q3', 'Dei', 'b_factor', 'R_squared', 'RMSE']].round(3),
+                use_container_width=True
+            )
         
         # Next step
         st.markdown("---")
@@ -1472,146 +1836,95 @@ elif page == "💾 Export Data":
     else:
         results_df = st.session_state.results_df
         
-        st.subheader("📊 Export Options")
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.markdown("### 📥 Fitted Parameters")
-            st.write("Download all fitted Arps parameters")
-            
-            # Convert to CSV
-            csv = results_df.to_csv(index=False)
+        if results_df.empty:
+            st.info("ℹ️ The analysis produced no fitted results to export.")
+        else:
+            st.subheader("📊 Export Options")
             
-            st.download_button(
-                label="Download Results CSV",
-                data=csv,
-                file_name="arps_fitted_parameters.csv",
-                mime="text/csv",
-                use_container_width=True
-            )
-        
-        with col2:
-            st.markdown("### 📈 Forecast Data")
-            st.write("Download forecast production data")
+            col1, col2, col3 = st.columns(3)
             
-            # Generate forecast data for all wells
-            forecast_data = []
+            with col1:
+                st.markdown("### 📥 Fitted Parameters")
+                st.write("Download all fitted Arps parameters")
+                
+                st.download_button(
+                    label="Download Results CSV",
+                    data=to_csv_bytes(results_df),
+                    file_name="arps_fitted_parameters.csv",
+                    mime="text/csv",
+                    use_container_width=True
+                )
+                st.download_button(
+                    label="Download Results Feather",
+                    data=to_feather_bytes(results_df),
+                    file_name="arps_fitted_parameters.feather",
+                    mime="application/octet-stream",
+                    use_container_width=True
+                )
             
-            for _, row in results_df.iterrows():
-                wellid = int(row['WellID'])
-                measure = row['Measure']
+            with col2:
+                st.markdown("### 📈 Forecast Data")
+                st.write("Download forecast production data")
                 
-                # Generate 60-month forecast
-                t_months = np.arange(0, 61)
-                def_val = 0.06 if measure == 'GAS' else 0.08
+                forecast_exports = build_forecast_exports(results_df)
                 
-                forecast = fcst.varps_decline(
-                    wellid, 1,
-                    row['Q3'],
-                    row['Dei'],
-                    def_val,
-                    row['b_factor'],
-                    t_months, 0, 0
-                )
+                if forecast_exports is None:
+                    st.info("No valid fits to forecast.")
+                else:
+                    st.download_button(
+                        label="Download Forecast CSV (gzip)",
+                        data=forecast_exports['csv_gz'],
+                        file_name="arps_forecast_data.csv.gz",
+                        mime="application/gzip",
+                        use_container_width=True
+                    )
+                    st.download_button(
+                        label="Download Forecast Parquet",
+                        data=forecast_exports['parquet'],
+                        file_name="arps_forecast_data.parquet",
+                        mime="application/octet-stream",
+                        use_container_width=True
+                    )
+            
+            with col3:
+                st.markdown("### 📊 Summary Report")
+                st.write("Download analysis summary")
                 
-                # Create DataFrame
-                for i in range(len(t_months)):
-                    forecast_data.append({
-                        'WellID': wellid,
-                        'Measure': measure,
-                        'Month': int(t_months[i]),
-                        'Rate': float(forecast[3][i]),
-                        'Cumulative': float(forecast[5][i])
-                    })
-            
-            forecast_df = pd.DataFrame(forecast_data)
-            forecast_csv = forecast_df.to_csv(index=False)
-            
-            st.download_button(
-                label="Download Forecast CSV",
-                data=forecast_csv,
-                file_name="arps_forecast_data.csv",
-                mime="text/csv",
-                use_container_width=True
-            )
-        
-        with col3:
-            st.markdown("### 📊 Summary Report")
-            st.write("Download analysis summary")
-            
-            # Create summary report
-            summary_lines = []
-            summary_lines.append("ARPS DECLINE CURVE ANALYSIS SUMMARY")
-            summary_lines.append("=" * 50)
-            summary_lines.append(f"\nAnalysis Date: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            summary_lines.append(f"\nTotal Wells Analyzed: {results_df['WellID'].nunique()}")
-            summary_lines.append(f"Total Fits: {len(results_df)}")
-            summary_lines.append(f"\nFit Quality:")
-            summary_lines.append(f"  Excellent (R² > 0.9): {(results_df['R_squared'] > 0.9).sum()}")
-            summary_lines.append(f"  Good (R² > 0.8): {(results_df['R_squared'] > 0.8).sum()}")
-            summary_lines.append(f"  Fair (R² > 0.7): {(results_df['R_squared'] > 0.7).sum()}")
-            summary_lines.append(f"\nAverage R²: {results_df['R_squared'].mean():.3f}")
-            summary_lines.append(f"Min R²: {results_df['R_squared'].min():.3f}")
-            summary_lines.append(f"Max R²: {results_df['R_squared'].max():.3f}")
-            summary_lines.append(f"\nBy Product:")
-            
-            for measure in ['OIL', 'GAS', 'WATER']:
-                subset = results_df[results_df['Measure'] == measure]
-                if len(subset) > 0:
-                    summary_lines.append(f"\n{measure}:")
-                    summary_lines.append(f"  Count: {len(subset)}")
-                    summary_lines.append(f"  Avg R²: {subset['R_squared'].mean():.3f}")
-                    summary_lines.append(f"  Avg Qi: {subset['Q3'].mean():.1f}")
-                    summary_lines.append(f"  Avg Dei: {subset['Dei'].mean():.3f}")
-                    summary_lines.append(f"  Avg b-factor: {subset['b_factor'].mean():.3f}")
-            
-            summary_text = "\n".join(summary_lines)
-            
-            st.download_button(
-                label="Download Summary TXT",
-                data=summary_text,
-                file_name="arps_analysis_summary.txt",
-                mime="text/plain",
-                use_container_width=True
-            )
-        
-        st.markdown("---")
-        
-        # Preview section
-        st.subheader("📋 Data Preview")
-        
-        tab1, tab2 = st.tabs(["Fitted Parameters", "Forecast Sample"])
-        
-        with tab1:
-            st.dataframe(results_df, use_container_width=True, height=400)
-        
-        with tab2:
-            # Show forecast for first well
-            sample_well = results_df.iloc[0]
-            wellid = int(sample_well['WellID'])
-            measure = sample_well['Measure']
+                summary_bytes = build_summary_report(results_df)
+                
+                st.download_button(
+                    label="Download Summary TXT",
+                    data=summary_bytes,
+                    file_name="arps_analysis_summary.txt",
+                    mime="text/plain",
+                    use_container_width=True
+                )
             
-            t_months = np.arange(0, 61)
-            def_val = 0.06 if measure == 'GAS' else 0.08
+            st.markdown("---")
             
-            forecast = fcst.varps_decline(
-                wellid, 1,
-                sample_well['Q3'],
-                sample_well['Dei'],
-                def_val,
-                sample_well['b_factor'],
-                t_months, 0, 0
-            )
+            # Preview section
+            st.subheader("📋 Data Preview")
             
-            sample_forecast_df = pd.DataFrame({
-                'Month': t_months,
-                'Rate': forecast[3],
-                'Cumulative': forecast[5]
-            })
+            tab1, tab2 = st.tabs(["Fitted Parameters", "Forecast Sample"])
             
-            st.write(f"**Sample:** Well {wellid} - {measure}")
-            st.dataframe(sample_forecast_df.head(24), use_container_width=True)
+            with tab1:
+                # Only a preview goes to the browser; the downloads above carry the full table
+                preview_rows = 200
+                st.dataframe(results_df.head(preview_rows), use_container_width=True, height=400)
+                if len(results_df) > preview_rows:
+                    st.caption(f"Showing {preview_rows} of {len(results_df)} rows — download CSV for full data.")
+            
+            with tab2:
+                # Show forecast for first well, taken from the batch forecast built above
+                sample_well = results_df.iloc[0]
+                wellid = sample_well['WellID']
+                measure = sample_well['Measure']
+                
+                if forecast_exports is None or forecast_exports['sample'].empty:
+                    st.info(f"No forecast for well {wellid} - {measure}: the fit did not produce valid parameters.")
+                else:
+                    st.write(f"**Sample:** Well {wellid} - {measure}")
+                    st.dataframe(forecast_exports['sample'], use_container_width=True)
 
 # Footer
 st.markdown("---")
@@ -6,7 +6,10 @@ Compares OLD method (wrong) vs NEW method (correct)
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from matplotlib.colors import to_rgb
 import sys
+import hashlib
+from pathlib import Path
 sys.path.append('/Users/vhoisington/Desktop/Project1/Petroleum-main')
 import AnalyticsAndDBScripts.prod_fcst_functions as fcst
 import warnings
@@ -15,13 +18,16 @@ warnings.filterwarnings('ignore')
 # Set plot style
 plt.style.use('seaborn-v0_8-darkgrid')
 
-def fit_arps_old_method(df_well, def_val=0.06):
+def blend_color(color, alpha, ax):
+    """Pre-blend a color over the axes background so the line can be drawn opaque"""
+    bg = np.array(to_rgb(ax.get_facecolor()))
+    return tuple(bg * (1 - alpha) + np.array(to_rgb(color)) * alpha)
+
+def fit_arps_old_method(df_well, t_full, def_val=0.06):
     """OLD METHOD (WRONG): Drops first row, uses max as Qi"""
-    # Drop first row (OLD METHOD)
-    df_fit = df_well.iloc[1:].reset_index(drop=True)
-    
-    t_act = df_fit['Date'].rank(method='min', ascending=True).to_numpy() - 1
-    q_act = df_fit['Value'].to_numpy()
+    # Drop first row (OLD METHOD); remaining rows are re-indexed from 0
+    t_act = t_full[:-1]
+    q_act = df_well['Value'].to_numpy()[1:]
     
     Qi_guess = np.max(q_act)  # OLD: use max
     Dei_guess = 0.15
@@ -40,14 +46,10 @@ def fit_arps_old_method(df_well, def_val=0.06):
     initial_guess = [Qi_guess, Dei_guess, b_guess]
     config = {'optimize': ['Qi', 'Dei', 'b'], 'fixed': {'Def': def_val}}
     
-    result = fcst.perform_curve_fit(t_act, q_act, initial_guess, bounds, config, method='curve_fit')
-    # Handle different return formats (OLD METHOD)
-    if isinstance(result, tuple) and len(result) > 1:
-        qi_fit, dei_fit, b_fit = result[0]
-    else:
-        qi_fit, dei_fit, b_fit = result
+    # perform_curve_fit always returns (params, success[, trace]) with params in optimize order
+    qi_fit, dei_fit, b_fit = fcst.perform_curve_fit(t_act, q_act, initial_guess, bounds, config, method='curve_fit')[0]
     
-    q_pred = fcst.varps_decline(1, 1, qi_fit, dei_fit, def_val, b_fit, t_act, 0, 0)[3]
+    q_pred = fcst.arps_decline_nb(1, 1, qi_fit, dei_fit, def_val, b_fit, t_act, 0, 0)[3]
     r2, rmse, mae = fcst.calc_goodness_of_fit(q_act, q_pred)
     
     print(f"\nFitted Parameters:")
@@ -65,13 +67,11 @@ def fit_arps_old_method(df_well, def_val=0.06):
         'r2': r2, 'rmse': rmse, 'mae': mae
     }
 
-def fit_arps_new_method(df_well, def_val=0.06):
+def fit_arps_new_method(df_well, t_full, def_val=0.06):
     """NEW METHOD (CORRECT): Keeps all rows, uses first point as Qi"""
     # Keep all rows (NEW METHOD)
-    df_fit = df_well.reset_index(drop=True)
-    
-    t_act = df_fit['Date'].rank(method='min', ascending=True).to_numpy() - 1
-    q_act = df_fit['Value'].to_numpy()
+    t_act = t_full
+    q_act = df_well['Value'].to_numpy()
     
     Qi_guess = q_act[0]  # NEW: use first point
     Dei_guess = 0.15
@@ -90,14 +90,9 @@ def fit_arps_new_method(df_well, def_val=0.06):
     initial_guess = [Qi_guess, Dei_guess, b_guess]
     config = {'optimize': ['Qi', 'Dei', 'b'], 'fixed': {'Def': def_val}}
     
-    result = fcst.perform_curve_fit(t_act, q_act, initial_guess, bounds, config, method='curve_fit')
-    # Handle different return formats (NEW METHOD)
-    if isinstance(result, tuple) and len(result) > 1:
-        qi_fit, dei_fit, b_fit = result[0]
-    else:
-        qi_fit, dei_fit, b_fit = result
+    qi_fit, dei_fit, b_fit = fcst.perform_curve_fit(t_act, q_act, initial_guess, bounds, config, method='curve_fit')[0]
     
-    q_pred = fcst.varps_decline(1, 1, qi_fit, dei_fit, def_val, b_fit, t_act, 0, 0)[3]
+    q_pred = fcst.arps_decline_nb(1, 1, qi_fit, dei_fit, def_val, b_fit, t_act, 0, 0)[3]
     r2, rmse, mae = fcst.calc_goodness_of_fit(q_act, q_pred)
     
     print(f"\nFitted Parameters:")
@@ -119,17 +114,17 @@ def fit_arps_new_method(df_well, def_val=0.06):
         'r2': r2, 'rmse': rmse, 'mae': mae
     }
 
-def create_visualizations(df_well, old_result, new_result):
+def create_visualizations(df_well, t_full, old_result, new_result):
     """Create comprehensive visualizations"""
     
     # Get all actual data
-    t_all = df_well['Date'].rank(method='min', ascending=True).to_numpy() - 1
+    t_all = t_full
     q_all = df_well['Value'].to_numpy()
     
     # Generate forecast (24 months ahead)
     t_forecast = np.arange(0, len(df_well) + 24)
-    q_forecast_old = fcst.varps_decline(1, 1, old_result['qi'], old_result['dei'], 0.06, old_result['b'], t_forecast, 0, 0)[3]
-    q_forecast_new = fcst.varps_decline(1, 1, new_result['qi'], new_result['dei'], 0.06, new_result['b'], t_forecast, 0, 0)[3]
+    q_forecast_old = fcst.arps_decline_nb(1, 1, old_result['qi'], old_result['dei'], 0.06, old_result['b'], t_forecast, 0, 0)[3]
+    q_forecast_new = fcst.arps_decline_nb(1, 1, new_result['qi'], new_result['dei'], 0.06, new_result['b'], t_forecast, 0, 0)[3]
     
     # Create figure with 4 subplots
     fig = plt.figure(figsize=(20, 12))
@@ -140,8 +135,8 @@ def create_visualizations(df_well, old_result, new_result):
     ax1.plot(t_all, q_all, 'o', color='black', markersize=8, label='All Actual Data', alpha=0.7, zorder=3)
     ax1.plot(old_result['t_act'], old_result['q_act'], 's', color='red', markersize=7, 
              label='Used in Fit (1st dropped)', alpha=0.8, zorder=4)
-    ax1.plot(t_forecast, q_forecast_old, '-', color='red', linewidth=2.5, 
-             label=f'OLD Fit (R²={old_result["r2"]:.3f})', alpha=0.8)
+    ax1.plot(t_forecast, q_forecast_old, '-', rasterized=True, color=blend_color('red', 0.8, ax1), linewidth=2.5, 
+             label=f'OLD Fit (R²={old_result["r2"]:.3f})')
     ax1.axvline(x=len(df_well)-1, color='gray', linestyle='--', alpha=0.5, linewidth=2)
     ax1.set_xlabel('Time (months)', fontsize=12, fontweight='bold')
     ax1.set_ylabel('Production Rate', fontsize=12, fontweight='bold')
@@ -155,7 +150,7 @@ def create_visualizations(df_well, old_result, new_result):
     ax2.semilogy(t_all, q_all, 'o', color='black', markersize=8, label='All Actual Data', alpha=0.7, zorder=3)
     ax2.semilogy(old_result['t_act'], old_result['q_act'], 's', color='red', markersize=7, 
                  label='Used in Fit', alpha=0.8, zorder=4)
-    ax2.semilogy(t_forecast, q_forecast_old, '-', color='red', linewidth=2.5, alpha=0.8)
+    ax2.semilogy(t_forecast, q_forecast_old, '-', rasterized=True, color=blend_color('red', 0.8, ax2), linewidth=2.5)
     ax2.axvline(x=len(df_well)-1, color='gray', linestyle='--', alpha=0.5, linewidth=2)
     ax2.set_xlabel('Time (months)', fontsize=12, fontweight='bold')
     ax2.set_ylabel('Production Rate (log)', fontsize=12, fontweight='bold')
@@ -168,8 +163,8 @@ def create_visualizations(df_well, old_result, new_result):
     ax3.plot(t_all, q_all, 'o', color='black', markersize=8, label='All Actual Data', alpha=0.7, zorder=3)
     ax3.plot(new_result['t_act'], new_result['q_act'], 's', color='green', markersize=7, 
              label='Used in Fit (all points)', alpha=0.8, zorder=4)
-    ax3.plot(t_forecast, q_forecast_new, '-', color='green', linewidth=2.5, 
-             label=f'NEW Fit (R²={new_result["r2"]:.3f})', alpha=0.8)
+    ax3.plot(t_forecast, q_forecast_new, '-', rasterized=True, color=blend_color('green', 0.8, ax3), linewidth=2.5, 
+             label=f'NEW Fit (R²={new_result["r2"]:.3f})')
     ax3.plot(0, q_all[0], '*', color='blue', markersize=20, label='First Point (t=0)', zorder=5)
     ax3.axvline(x=len(df_well)-1, color='gray', linestyle='--', alpha=0.5, linewidth=2)
     ax3.set_xlabel('Time (months)', fontsize=12, fontweight='bold')
@@ -184,7 +179,7 @@ def create_visualizations(df_well, old_result, new_result):
     ax4.semilogy(t_all, q_all, 'o', color='black', markersize=8, label='All Actual Data', alpha=0.7, zorder=3)
     ax4.semilogy(new_result['t_act'], new_result['q_act'], 's', color='green', markersize=7, 
                  label='Used in Fit', alpha=0.8, zorder=4)
-    ax4.semilogy(t_forecast, q_forecast_new, '-', color='green', linewidth=2.5, alpha=0.8)
+    ax4.semilogy(t_forecast, q_forecast_new, '-', rasterized=True, color=blend_color('green', 0.8, ax4), linewidth=2.5)
     ax4.semilogy(0, q_all[0], '*', color='blue', markersize=20, label='First Point (t=0)', zorder=5)
     ax4.axvline(x=len(df_well)-1, color='gray', linestyle='--', alpha=0.5, linewidth=2)
     ax4.set_xlabel('Time (months)', fontsize=12, fontweight='bold')
@@ -196,9 +191,9 @@ def create_visualizations(df_well, old_result, new_result):
     # 5. OVERLAY COMPARISON - Linear
     ax5 = fig.add_subplot(gs[2, 0])
     ax5.plot(t_all, q_all, 'o', color='black', markersize=10, label='Actual Data', alpha=0.7, zorder=3)
-    ax5.plot(t_forecast, q_forecast_old, '-', color='red', linewidth=3, 
+    ax5.plot(t_forecast, q_forecast_old, '-', rasterized=True, color='red', linewidth=3, 
              label=f'OLD (R²={old_result["r2"]:.3f})', alpha=0.6)
-    ax5.plot(t_forecast, q_forecast_new, '-', color='green', linewidth=3, 
+    ax5.plot(t_forecast, q_forecast_new, '-', rasterized=True, color='green', linewidth=3, 
              label=f'NEW (R²={new_result["r2"]:.3f})', alpha=0.6)
     ax5.plot(0, q_all[0], '*', color='blue', markersize=20, label='First Point', zorder=5)
     ax5.axvline(x=len(df_well)-1, color='gray', linestyle='--', alpha=0.5, linewidth=2, label='Forecast Start')
@@ -211,9 +206,9 @@ def create_visualizations(df_well, old_result, new_result):
     # 6. OVERLAY COMPARISON - Log
     ax6 = fig.add_subplot(gs[2, 1])
     ax6.semilogy(t_all, q_all, 'o', color='black', markersize=10, label='Actual Data', alpha=0.7, zorder=3)
-    ax6.semilogy(t_forecast, q_forecast_old, '-', color='red', linewidth=3, 
+    ax6.semilogy(t_forecast, q_forecast_old, '-', rasterized=True, color='red', linewidth=3, 
                  label=f'OLD Method', alpha=0.6)
-    ax6.semilogy(t_forecast, q_forecast_new, '-', color='green', linewidth=3, 
+    ax6.semilogy(t_forecast, q_forecast_new, '-', rasterized=True, color='green', linewidth=3, 
                  label=f'NEW Method', alpha=0.6)
     ax6.semilogy(0, q_all[0], '*', color='blue', markersize=20, label='First Point', zorder=5)
     ax6.axvline(x=len(df_well)-1, color='gray', linestyle='--', alpha=0.5, linewidth=2)
@@ -226,18 +221,35 @@ def create_visualizations(df_well, old_result, new_result):
     plt.suptitle('ARPS Curve Fitting Validation: OLD vs NEW Method', 
                  fontsize=18, fontweight='bold', y=0.995)
     
-    plt.savefig('arps_validation_complete.png', dpi=150, bbox_inches='tight')
+    plt.savefig('arps_validation_complete.png', dpi=100, bbox_inches='tight')
     print("\n✓ Saved visualization as 'arps_validation_complete.png'")
     plt.show()
 
+# Parquet copies of parsed CSVs (git-ignored)
+CACHE_DIR = Path(__file__).parent / '.arps_cache'
+
+def _load_cached(path):
+    """Load production CSV, reusing a Parquet copy under .arps_cache/ when it is up to date"""
+    path = Path(path).resolve()
+    # Stem plus a path hash, so same-named CSVs in different folders don't share an entry
+    path_key = hashlib.md5(str(path).encode('utf-8')).hexdigest()[:8]
+    cache_path = CACHE_DIR / f'{path.stem}-{path_key}.parquet'
+    if cache_path.exists() and cache_path.stat().st_mtime >= path.stat().st_mtime:
+        return pd.read_parquet(cache_path, engine='pyarrow')
+    df = pd.read_csv(path)
+    df['Date'] = pd.to_datetime(df['Date'])
+    df['Measure'] = df['Measure'].astype('category')
+    CACHE_DIR.mkdir(exist_ok=True)
+    df.to_parquet(cache_path, engine='pyarrow', index=False)
+    return df
+
 def main():
     print("="*60)
     print("ARPS CURVE FITTING - VISUAL VALIDATION")
     print("="*60)
     
     # Load data
-    df = pd.read_csv('sample_production_data.csv')
-    df['Date'] = pd.to_datetime(df['Date'])
+    df = _load_cached('sample_production_data.csv')
     
     # Filter for one well
     well_id = 12345678901
@@ -253,9 +265,12 @@ def main():
     print(f"First rate: {df_well['Value'].iloc[0]:.2f}")
     print(f"Max rate: {df_well['Value'].max():.2f}")
     
+    # Month index of each (date-sorted, one row per month) record, shared by both fits and the plots
+    t_full = np.arange(len(df_well), dtype=np.float64)
+    
     # Fit both methods
-    old_result = fit_arps_old_method(df_well)
-    new_result = fit_arps_new_method(df_well)
+    old_result = fit_arps_old_method(df_well, t_full)
+    new_result = fit_arps_new_method(df_well, t_full)
     
     # Print comparison
     print("\n" + "="*60)
@@ -266,7 +281,7 @@ def main():
     print(f"MAE improvement:  {old_result['mae'] - new_result['mae']:+.4f}  ({(old_result['mae'] - new_result['mae'])/old_result['mae']*100:+.1f}%)")
     
     # Create visualizations
-    create_visualizations(df_well, old_result, new_result)
+    create_visualizations(df_well, t_full, old_result, new_result)
     
     print("\n" + "="*60)
     print("✓ VALIDATION COMPLETE")